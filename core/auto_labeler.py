@@ -7,13 +7,16 @@
 import os
 import time
 import re
-from typing import Dict, List, Optional, Tuple
+from typing import Dict, Iterator, List, Optional, Tuple
 from pathlib import Path
 from PyQt6.QtCore import QThread, pyqtSignal, QObject
 
 from core.model_manager import model_manager
 from models.database import db
 
+# 批量标注时每次前向传播的图像数量
+BATCH_INFERENCE_SIZE = 16
+
 
 class AutoLabeler:
     """自动打标签器"""
@@ -117,6 +120,34 @@ class AutoLabeler:
         annotations = self._generate_annotations(result, image_id, config)
         return annotations
     
+    def process_images(self, image_paths: List[str], image_ids: List[int], config: Dict,
+                       batch_size: int = BATCH_INFERENCE_SIZE) -> Iterator[List[Dict]]:
+        """批量处理多张图像
+        
+        Args:
+            image_paths: 图像路径列表
+            image_ids: 与image_paths一一对应的图像ID列表
+            config: 推理配置
+            batch_size: 每次前向传播的图像数量
+            
+        Yields:
+            每张图像生成的标注列表，顺序与image_paths一致
+        """
+        if not self.current_model:
+            for _ in image_paths:
+                yield []
+            return
+        
+        # 推理参数
+        conf_threshold = config.get('conf_threshold', 0.5)
+        iou_threshold = config.get('iou_threshold', 0.45)
+        
+        results = model_manager.infer_batch(
+            self.current_model, image_paths, conf_threshold, iou_threshold, batch_size
+        )
+        for image_id, result in zip(image_ids, results):
+            yield self._generate_annotations(result, image_id, config) if result else []
+    
     def _generate_annotations(self, result: object, image_id: int, config: Dict) -> List[Dict]:
         """根据推理结果生成标注
         
@@ -506,41 +537,45 @@ class BatchLabelingThread(QThread):
         processed = 0
         labeled = 0
         
+        batch_size = max(1, int(self.config.get('batch_size', BATCH_INFERENCE_SIZE)))
+        overwrite = self.config.get('overwrite_labels', False)
+        
         try:
-            for i, image in enumerate(self.images):
-                if not self._is_running:
-                    break
-                
-                # 检查是否暂停
-                while self._is_paused:
-                    time.sleep(0.1)
-                    if not self._is_running:
-                        break
-                
-                if not self._is_running:
+            # 跳过不存在的图像，剩余图像按batch_size分块批量推理
+            valid_images = [
+                image for image in self.images
+                if image.get('storage_path', '') and os.path.exists(image.get('storage_path', ''))
+            ]
+            
+            for start in range(0, len(valid_images), batch_size):
+                if not self._wait_if_paused():
                     break
                 
-                # 处理图像
-                image_path = image.get('storage_path', '')
-                image_id = image.get('id', 0)
+                chunk = valid_images[start:start + batch_size]
+                image_paths = [image.get('storage_path', '') for image in chunk]
+                image_ids = [image.get('id', 0) for image in chunk]
                 
-                if image_path and os.path.exists(image_path):
-                    annotations = self.auto_labeler.process_single_image(
-                        image_path, image_id, self.config
-                    )
-                    
+                results = self.auto_labeler.process_images(
+                    image_paths, image_ids, self.config, batch_size
+                )
+                for image_path, image_id, annotations in zip(image_paths, image_ids, results):
                     if annotations:
                         # 保存标注
-                        overwrite = self.config.get('overwrite_labels', False)
                         self.auto_labeler.save_annotations(
                             annotations, image_id, overwrite
                         )
                         labeled += len(annotations)
-                        
+                    
                     # 发送信号
                     processed += 1
                     self.progress_updated.emit(processed, total, labeled)
                     self.image_processed.emit(image_path, len(annotations))
+                    
+                    if not self._wait_if_paused():
+                        break
+                
+                if not self._is_running:
+                    break
                 
                 # 避免CPU占用过高
                 time.sleep(0.01)
@@ -553,6 +588,12 @@ class BatchLabelingThread(QThread):
         except Exception as e:
             self.batch_completed.emit(False, f"批量标注出错: {str(e)}")
     
+    def _wait_if_paused(self) -> bool:
+        """暂停时阻塞等待，返回是否应继续运行"""
+        while self._is_paused and self._is_running:
+            time.sleep(0.1)
+        return self._is_running
+    
     def pause(self):
         """暂停"""
         self._is_paused = True
@@ -605,7 +646,8 @@ class BatchLabelingManager(QObject):
                 'conf_threshold': conf_threshold,
                 'iou_threshold': iou_threshold,
                 'class_mappings': class_mapping,
-                'overwrite_labels': True
+                'overwrite_labels': True,
+                'batch_size': BATCH_INFERENCE_SIZE
             }
             
             # 加载模型
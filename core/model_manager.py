@@ -6,7 +6,7 @@
 
 import os
 import sys
-from typing import Dict, List, Optional, Tuple
+from typing import Dict, Iterator, List, Optional, Tuple
 from pathlib import Path
 
 # Ultralytics YOLO 导入
@@ -249,6 +249,39 @@ class ModelManager:
             print(f"Error during inference: {e}")
             return None
     
+    def infer_batch(self, model: YOLO, image_paths: List[str], conf: float = 0.5, iou: float = 0.45,
+                    batch_size: int = 16) -> Iterator[Optional[Results]]:
+        """使用模型对多张图像进行批量推理
+        
+        Args:
+            model: YOLO模型实例
+            image_paths: 图像路径列表
+            conf: 置信度阈值
+            iou: IOU阈值
+            batch_size: 每次前向传播的图像数量
+            
+        Yields:
+            与image_paths一一对应的推理结果，推理失败的图像为None
+        """
+        yielded = 0
+        try:
+            # stream=True 按图像逐个产出结果，避免整批结果同时驻留内存
+            for result in model.predict(
+                source=list(image_paths),
+                conf=conf,
+                iou=iou,
+                batch=batch_size,
+                stream=True,
+                verbose=False
+            ):
+                yielded += 1
+                yield result
+        except Exception as e:
+            print(f"Error during batch inference: {e}")
+            # 推理中途失败时，剩余图像逐张推理，单张失败只影响该图像（结果为None），保持与输入一一对应
+            for image_path in image_paths[yielded:]:
+                yield self.infer(model, image_path, conf, iou)
+    
     def unload_model(self, model_key: str):
         """卸载模型
         
@@ -12,22 +12,22 @@ from PyQt6.QtWidgets import (
     QRadioButton, QSpinBox, QDoubleSpinBox, QFormLayout,
     QGroupBox, QCheckBox, QSlider, QTextEdit, QInputDialog,
     QSizePolicy, QToolButton,
-    QColorDialog, QDialog, QApplication, QAbstractSpinBox
+    QColorDialog, QDialog, QApplication, QAbstractSpinBox, QStyledItemDelegate
 )
 import math
+from collections import deque
 
 # 导入自动标注相关模块
 from gui.pages.auto_label_dialog import AutoLabelDialog
 from gui.pages.batch_process_dialog import BatchProcessDialog
-from core.auto_labeler import BatchLabelingManager
-from core.model_manager import ModelManager
-from PyQt6.QtCore import Qt, pyqtSignal, QThread, QSize, QPoint, QRect
-from PyQt6.QtGui import QPixmap, QImage, QPainter, QColor, QFont, QKeyEvent, QMouseEvent, QWheelEvent, QAction, QIcon, QPen, QBrush, QShortcut, QKeySequence
+from PyQt6.QtCore import Qt, pyqtSignal, QThread, QSize, QPoint, QRect, QTimer, QSettings
+from PyQt6.QtGui import QPixmap, QPixmapCache, QImage, QPainter, QPolygon, QColor, QFont, QKeyEvent, QMouseEvent, QWheelEvent, QAction, QIcon, QPen, QBrush, QShortcut, QKeySequence
 import cv2
 import numpy as np
 from pathlib import Path
 from typing import List, Dict, Optional, Tuple
 import os
+import io
 import gc
 import threading
 import random
@@ -39,6 +39,250 @@ from gui.widgets.loading_dialog import LoadingOverlay
 SAM3_DOWNLOAD_URL = "https://huggingface.co/1038lab/sam3/discussions/1"
 NEGATIVE_SAMPLE_CLASS_ID = -1
 
+_settings = None
+
+
+def get_settings() -> QSettings:
+    """获取共享的应用设置对象（同一进程内的QSettings共享存储，无需重复构造）"""
+    global _settings
+    if _settings is None:
+        _settings = QSettings("EzYOLO", "Settings")
+    return _settings
+
+# 页面静态样式表（COLORS 在导入时即确定，只需格式化一次）
+_LEFT_PANEL_QSS = f"""
+    QFrame {{
+        background-color: {COLORS['panel']};
+        border-right: 1px solid {COLORS['border']};
+    }}
+"""
+_IMAGE_LIST_QSS = f"""
+    QListWidget {{
+        background-color: {COLORS['sidebar']};
+        border: 1px solid {COLORS['border']};
+        border-radius: 4px;
+    }}
+    QListWidget::item {{
+        background-color: {COLORS['panel']};
+        border-radius: 4px;
+        padding: 4px;
+    }}
+    QListWidget::item:selected {{
+        background-color: {COLORS['primary']};
+    }}
+"""
+_TOOLBAR_QSS = f"""
+    QFrame {{
+        background-color: {COLORS['panel']};
+        border: 1px solid {COLORS['border']};
+        border-radius: 6px;
+    }}
+"""
+_RIGHT_PANEL_QSS = f"""
+    QFrame {{
+        background-color: {COLORS['panel']};
+        border-left: 1px solid {COLORS['border']};
+    }}
+"""
+_GROUP_BOX_QSS = f"""
+    QGroupBox {{
+        color: {COLORS['text_primary']};
+        font-weight: bold;
+        border: 1px solid {COLORS['border']};
+        border-radius: 4px;
+        margin-top: 8px;
+        padding-top: 8px;
+    }}
+    QGroupBox::title {{
+        subcontrol-origin: margin;
+        left: 8px;
+        padding: 0 4px;
+    }}
+"""
+_CLASS_LIST_QSS = f"""
+    QListWidget {{
+        background-color: {COLORS['sidebar']};
+        border: 1px solid {COLORS['border']};
+    }}
+    QListWidget::item {{
+        padding: 6px 8px;
+        min-height: 24px;
+    }}
+    QListWidget::item:selected {{
+        background-color: {COLORS['primary']};
+    }}
+"""
+_STATUS_BAR_QSS = f"""
+    QFrame {{
+        background-color: {COLORS['panel']};
+        border-top: 1px solid {COLORS['border']};
+    }}
+    QLabel {{
+        color: {COLORS['text_secondary']};
+        font-size: 12px;
+        padding: 4px 12px;
+    }}
+"""
+
+
+def points_in_polygon(points: np.ndarray, poly: np.ndarray) -> np.ndarray:
+    """射线法判断 (M, 2) 个点是否在多边形内，返回 (M,) 布尔数组（matplotlib不可用时的备用实现）
+
+    用叉积符号代替交点横坐标的除法计算（Hao et al. 2018），无除法、无分支。
+    """
+    poly = np.asarray(poly, dtype=np.float64)
+    xs = poly[:, 0]
+    ys = poly[:, 1]
+    xs2 = np.roll(xs, -1)
+    ys2 = np.roll(ys, -1)
+    px = np.asarray(points, dtype=np.float64)[:, 0:1]
+    py = np.asarray(points, dtype=np.float64)[:, 1:2]
+    crosses = (ys > py) != (ys2 > py)
+    cross = (xs2 - xs) * (py - ys) - (px - xs) * (ys2 - ys)
+    return (np.count_nonzero(crosses & ((cross > 0) == (ys2 > ys)), axis=1) & 1).astype(bool)
+
+
+_mpl_path_class = None
+
+
+def _get_mpl_path_class():
+    """延迟导入matplotlib.path.Path，未安装matplotlib时返回None走NumPy实现。"""
+    global _mpl_path_class
+    if _mpl_path_class is None:
+        try:
+            from matplotlib.path import Path as MplPath
+            _mpl_path_class = MplPath
+        except ImportError:
+            _mpl_path_class = False
+    return _mpl_path_class or None
+
+
+def get_polygon_array(annotation: Dict) -> Optional[np.ndarray]:
+    """获取标注的多边形顶点 (N, 2) float32 数组，并把数组和外接框缓存在标注字典上
+    
+    缓存放在标注顶层的私有键上（不进入 'data'，不会被写入数据库）；
+    顶点少于3个时返回None。
+    """
+    poly = annotation.get('_poly_np')
+    if poly is None:
+        points = annotation.get('data', {}).get('points', [])
+        if len(points) < 3:
+            return None
+        poly = np.fromiter(
+            (c for p in points for c in (p['x'], p['y'])),
+            dtype=np.float32, count=2 * len(points)
+        ).reshape(-1, 2)
+        annotation['_poly_np'] = poly
+        x_min, y_min = poly.min(axis=0)
+        x_max, y_max = poly.max(axis=0)
+        annotation['_poly_bbox'] = (float(x_min), float(y_min), float(x_max), float(y_max))
+    return poly
+
+
+def get_polygon_path(annotation: Dict):
+    """获取标注多边形的matplotlib Path（C实现的点包含判定），缓存在标注的 '_poly_path' 上
+    
+    顶点少于3个或未安装matplotlib时返回None。
+    """
+    path = annotation.get('_poly_path')
+    if path is None:
+        path_class = _get_mpl_path_class()
+        poly = get_polygon_array(annotation)
+        if path_class is None or poly is None:
+            return None
+        path = path_class(poly)
+        annotation['_poly_path'] = path
+    return path
+
+
+def polygon_contains_points(annotation: Dict, points: np.ndarray) -> np.ndarray:
+    """判断 (M, 2) 个图像坐标点是否在标注多边形内，返回 (M,) 布尔数组"""
+    path = get_polygon_path(annotation)
+    if path is not None:
+        return path.contains_points(points)
+    poly = get_polygon_array(annotation)
+    if poly is None:
+        return np.zeros(len(points), dtype=bool)
+    return points_in_polygon(points, poly)
+
+
+EXPORT_COPY_WORKERS = 8  # 导出数据集时并行复制图片的线程数
+
+
+def _copy_file_if_exists(src: str, dst: str) -> bool:
+    """复制文件内容，源文件不存在时返回False而不是报错
+    
+    直接尝试复制，只在失败时才检查源文件，正常路径省去一次stat。
+    """
+    import shutil
+    
+    try:
+        shutil.copyfile(src, dst)
+    except FileNotFoundError:
+        if os.path.exists(src):
+            raise  # 源文件存在，说明是目标路径的问题
+        return False
+    return True
+
+
+def copy_files_parallel(pairs: List[Tuple[str, str]], progress_callback=None) -> int:
+    """用线程池并行复制 (源路径, 目标路径) 列表，返回复制成功的文件数
+    
+    只复制文件内容（shutil.copyfile），不复制元数据；源文件不存在的条目会被跳过。
+    progress_callback(已完成数量) 在调用线程中按完成顺序回调。
+    """
+    from concurrent.futures import ThreadPoolExecutor, as_completed
+    
+    copied = 0
+    with ThreadPoolExecutor(max_workers=EXPORT_COPY_WORKERS) as executor:
+        futures = [executor.submit(_copy_file_if_exists, src, dst) for src, dst in pairs]
+        for done, future in enumerate(as_completed(futures), 1):
+            if future.result():
+                copied += 1
+            if progress_callback is not None:
+                progress_callback(done)
+    return copied
+
+
+def collect_yolo_bbox_rows(images: List[Dict], annotations_by_image: Dict[int, List[Dict]]) -> List[Tuple]:
+    """按图片和标注顺序收集矩形框导出行 (class_id, x, y, width, height, 图片宽, 图片高)"""
+    rows = []
+    for image in images:
+        img_width = image.get('width', 1920)  # 默认宽度
+        img_height = image.get('height', 1080)  # 默认高度
+        for ann in annotations_by_image.get(image['id'], []):
+            if ann.get('type', 'bbox') == 'bbox':
+                data = ann.get('data', {})
+                rows.append((
+                    ann.get('class_id', 0),
+                    data.get('x', 0), data.get('y', 0),
+                    data.get('width', 0), data.get('height', 0),
+                    img_width, img_height
+                ))
+    return rows
+
+
+def yolo_bbox_lines(rows: List[Tuple]) -> List[str]:
+    """把 collect_yolo_bbox_rows 的结果一次性向量化归一化，返回YOLO标签行
+    
+    格式：class_id x_center y_center width height
+    面积为0的框不生成标签，对应位置返回空字符串，保持与 rows 一一对应。
+    """
+    table = np.asarray(rows, dtype=np.float64).reshape(-1, 7)
+    valid = table[:, 3] * table[:, 4] != 0
+    table = table[valid]
+    xy = table[:, 1:3]
+    wh = table[:, 3:5]
+    size = table[:, 5:7]
+    normalized = np.column_stack((table[:, 0], (xy + wh / 2) / size, wh / size))
+    buffer = io.StringIO()
+    np.savetxt(buffer, normalized, fmt='%d %.6f %.6f %.6f %.6f')
+    
+    lines = [''] * len(valid)
+    for index, line in zip(np.flatnonzero(valid).tolist(), buffer.getvalue().splitlines(keepends=True)):
+        lines[index] = line
+    return lines
+
 
 class SAMModelManager:
     """SAM模型缓存管理器：同配置复用，切换配置自动释放重载。"""
@@ -335,6 +579,60 @@ class SAMInferenceWorker(QThread):
                 self.inference_finished.emit(False, f"推理出错: {str(e)}", None)
 
 
+THUMBNAIL_SIZE = 80
+THUMBNAIL_CACHE_LIMIT_KB = 50 * 1024  # 缩略图缓存上限 50 MB
+THUMBNAIL_KEY_ROLE = Qt.ItemDataRole.UserRole + 1  # 列表项上的 QPixmapCache 键
+THUMBNAIL_PATH_ROLE = Qt.ItemDataRole.UserRole + 2  # 缓存失效时重新加载用的图片路径
+IMAGE_STATUS_ROLE = Qt.ItemDataRole.UserRole + 3  # 列表项当前显示的图片状态
+MAX_HISTORY_SIZE = 50  # 撤销历史最多保留的记录数
+DEFAULT_CLASS_QCOLOR = QColor(128, 128, 128)  # 未知类别的绘制颜色
+IMAGE_NAV_THROTTLE_MS = 40  # 按住翻页快捷键时，两次真正加载图片之间的最小间隔
+
+
+def load_thumbnail(storage_path: str) -> QPixmap:
+    """从磁盘读取图片并生成缩略图，失败时返回占位图"""
+    pixmap = None
+    
+    if storage_path and os.path.exists(storage_path):
+        try:
+            img = cv2.imread(storage_path)
+            if img is not None:
+                img = cv2.resize(img, (THUMBNAIL_SIZE, THUMBNAIL_SIZE))
+                img = cv2.cvtColor(img, cv2.COLOR_BGR2RGB)
+                h, w, ch = img.shape
+                bytes_per_line = ch * w
+                qt_image = QImage(img.data, w, h, bytes_per_line, QImage.Format.Format_RGB888)
+                pixmap = QPixmap.fromImage(qt_image)
+        except Exception:
+            pass
+    
+    if pixmap is None or pixmap.isNull():
+        pixmap = QPixmap(THUMBNAIL_SIZE, THUMBNAIL_SIZE)
+        pixmap.fill(QColor(COLORS['sidebar']))
+    return pixmap
+
+
+class ThumbnailItemDelegate(QStyledItemDelegate):
+    """从 QPixmapCache 取缩略图绘制的列表项委托
+    
+    列表项只保存缓存键和图片路径，缩略图由 QPixmapCache 按上限统一管理；
+    被淘汰的缩略图在重新绘制时从磁盘按需重新生成。
+    """
+    
+    def initStyleOption(self, option, index):
+        super().initStyleOption(option, index)
+        key = index.data(THUMBNAIL_KEY_ROLE)
+        if not key:
+            return
+        pixmap = QPixmapCache.find(key)
+        if pixmap is None or pixmap.isNull():
+            pixmap = load_thumbnail(index.data(THUMBNAIL_PATH_ROLE) or '')
+            QPixmapCache.insert(key, pixmap)
+        option.icon = QIcon(pixmap)
+        option.decorationSize = pixmap.size()
+        option.features |= option.ViewItemFeature.HasDecoration
+
+
 class AnnotateImageLoadWorker(QThread):
     """标注页面图片加载工作线程"""
     
@@ -352,26 +650,7 @@ class AnnotateImageLoadWorker(QThread):
             if not self._is_running:
                 break
             
-            storage_path = image_data.get('storage_path', '')
-            pixmap = None
-            
-            if storage_path and os.path.exists(storage_path):
-                try:
-                    img = cv2.imread(storage_path)
-                    if img is not None:
-                        img = cv2.resize(img, (80, 80))
-                        img = cv2.cvtColor(img, cv2.COLOR_BGR2RGB)
-                        h, w, ch = img.shape
-                        bytes_per_line = ch * w
-                        qt_image = QImage(img.data, w, h, bytes_per_line, QImage.Format.Format_RGB888)
-                        pixmap = QPixmap.fromImage(qt_image)
-                except Exception:
-                    pass
-            
-            if pixmap is None or pixmap.isNull():
-                pixmap = QPixmap(80, 80)
-                pixmap.fill(QColor(COLORS['sidebar']))
-            
+            pixmap = load_thumbnail(image_data.get('storage_path', ''))
             self.image_loaded.emit(i, pixmap)
             
             if i % 10 == 0:
@@ -463,6 +742,463 @@ class RandomSampleDeleteWorker(QThread):
         self._is_running = False
 
 
+class SingleInferenceWorker(QThread):
+    """单张图像自动标注推理线程（模型加载和推理都在后台进行）"""
+    
+    inference_finished = pyqtSignal(bool, list, str)  # 成功, 标注列表, 错误信息
+    
+    def __init__(self, labeler, load_model, image_path: str, image_id: int,
+                 config: Dict, overwrite_labels: bool):
+        super().__init__()
+        self.labeler = labeler
+        self.load_model = load_model  # 模型加载函数，None表示无需加载
+        self.image_path = image_path
+        self.image_id = image_id
+        self.config = config
+        self.overwrite_labels = overwrite_labels
+    
+    def run(self):
+        """加载模型并推理"""
+        try:
+            if self.load_model is not None:
+                self.load_model()
+            annotations = self.labeler.process_single_image(self.image_path, self.image_id, self.config)
+            self.inference_finished.emit(True, annotations or [], "")
+        except Exception as e:
+            self.inference_finished.emit(False, [], str(e))
+
+
+class AnnotationSaveWorker(QThread):
+    """推理结果批量写入线程（覆盖原标注时删除与写入在同一事务中完成）"""
+    
+    save_finished = pyqtSignal(bool, int, str)  # 成功, 图片ID, 错误信息
+    
+    def __init__(self, image_id: int, project_id: int, annotations: List[Dict], replace: bool = False):
+        super().__init__()
+        self.image_id = image_id
+        self.project_id = project_id
+        self.annotations = annotations
+        self.replace = replace
+    
+    def run(self):
+        """在后台线程中一次性写入所有标注"""
+        try:
+            db.add_annotations(self.image_id, self.project_id, self.annotations, replace=self.replace)
+            self.save_finished.emit(True, self.image_id, "")
+        except Exception as e:
+            self.save_finished.emit(False, self.image_id, str(e))
+
+
+class ProjectLoadThread(QThread):
+    """项目数据加载线程"""
+    
+    data_loaded = pyqtSignal(dict)
+    finished = pyqtSignal()
+    
+    def __init__(self, project_id):
+        super().__init__()
+        self.project_id = project_id
+    
+    def run(self):
+        """运行线程"""
+        try:
+            # 加载项目信息
+            project = db.get_project(self.project_id)
+            classes = []
+            
+            if project:
+                # 加载类别
+                import json
+                try:
+                    classes = json.loads(project.get('classes', '[]'))
+                except:
+                    classes = []
+                
+                if not classes:
+                    # 添加默认类别
+                    classes = [
+                        {'id': 0, 'name': 'person', 'color': '#FF0000'},
+                        {'id': 1, 'name': 'car', 'color': '#00FF00'}
+                    ]
+            
+            # 加载图片列表数据
+            images = db.get_project_images(self.project_id)
+            
+            # 发送加载完成信号
+            self.data_loaded.emit({'classes': classes, 'images': images})
+        finally:
+            self.finished.emit()
+
+
+class LLMInferenceWorker(QThread):
+    """LLM推理工作线程"""
+    inference_finished = pyqtSignal(bool, str, list)  # 成功, 消息, 检测结果
+    
+    def __init__(self, config, image_path, target):
+        super().__init__()
+        self.config = config
+        self.image_path = image_path
+        self.target = target
+    
+    def run(self):
+        try:
+            import base64
+            import re
+            from openai import OpenAI
+            
+            # 读取图片
+            with open(self.image_path, "rb") as f:
+                img_base64 = base64.b64encode(f.read()).decode("utf-8")
+            
+            # 创建客户端
+            client = OpenAI(
+                api_key=self.config['api_key'],
+                base_url=self.config['base_url']
+            )
+            
+            # 格式化提示词
+            system_prompt = self.config['system_prompt']
+            user_prompt = self.config['user_prompt'].format(target=self.target)
+            
+            # 调用API
+            completion = client.chat.completions.create(
+                model=self.config['model_name'],
+                messages=[
+                    {"role": "system", "content": system_prompt},
+                    {
+                        "role": "user",
+                        "content": [
+                            {"type": "text", "text": user_prompt},
+                            {
+                                "type": "image_url",
+                                "image_url": {"url": f"data:image/jpeg;base64,{img_base64}"}
+                            }
+                        ]
+                    }
+                ]
+            )
+            
+            response_text = completion.choices[0].message.content
+            print(f"LLM返回:\n{response_text}")
+            
+            # 解析返回的文本格式: target,[xmin,ymin,xmax,ymax]
+            detections = []
+            pattern = r'([^,\n]+),\[(\d+),(\d+),(\d+),(\d+)\]'
+            matches = re.findall(pattern, response_text)
+            
+            for match in matches:
+                label, xmin, ymin, xmax, ymax = match
+                detections.append({
+                    "label": label.strip(),
+                    "bbox": [int(xmin), int(ymin), int(xmax), int(ymax)]
+                })
+            
+            self.inference_finished.emit(True, f"检测到 {len(detections)} 个目标", detections)
+        
+        except Exception as e:
+            self.inference_finished.emit(False, f"推理出错: {str(e)}", [])
+
+
+class ExportWorker(QThread):
+    """导出线程：在后台生成标注文件或完整数据集，避免大项目导出时界面卡死"""
+    
+    progress_updated = pyqtSignal(int, int, str)  # 当前进度, 总数, 说明
+    export_finished = pyqtSignal(bool, str)  # 成功, 消息
+    
+    def __init__(self, mode: str, project_id: int, project_name: str, classes: List[Dict],
+                 export_dir: str, export_format: str):
+        super().__init__()
+        self.mode = mode  # 'annotations' 导出标注文件，'dataset' 导出完整数据集
+        self.project_id = project_id
+        self.project_name = project_name
+        # 按类别ID排好序的快照，导出期间界面仍可修改类别
+        self.classes = [dict(cls) for cls in classes]
+        self.export_dir = export_dir
+        self.export_format = export_format
+    
+    def run(self):
+        """执行导出"""
+        try:
+            if self.mode == 'dataset':
+                message = self._export_dataset()
+            else:
+                message = self._export_annotations()
+            if message is not None:
+                self.export_finished.emit(True, message)
+        except Exception as e:
+            self.export_finished.emit(False, f"导出过程中出错:\n{str(e)}")
+    
+    def _report_progress(self, current: int, total: int, text: str):
+        """只在整数百分比变化时发送进度，避免信号淹没界面线程"""
+        if current == total or current * 100 // total != (current - 1) * 100 // total:
+            self.progress_updated.emit(current, total, text)
+    
+    # 分割标注类型 -> data 中保存多边形顶点的键
+    _SEGMENT_POINT_KEYS = {'polygon': 'points', 'mask': 'mask'}
+    
+    def _write_yolo_labels(self, images: List[Dict], labels_dir: str,
+                           annotations_by_image: Dict[int, List[Dict]]) -> Tuple[int, int]:
+        """按YOLO格式为每张图片写标签文件，返回 (导出文件数, 负样本数)
+        
+        矩形框一次性向量化归一化；多边形/掩码按分割格式逐点归一化。
+        """
+        # 所有矩形框一次性向量化归一化，写文件时按顺序取用
+        bbox_lines = iter(yolo_bbox_lines(collect_yolo_bbox_rows(images, annotations_by_image)))
+        
+        exported_count = 0
+        negative_count = 0
+        for index, image in enumerate(images, 1):
+            self._report_progress(index, len(images), "正在写入标注...")
+            image_id = image['id']
+            annotations = annotations_by_image.get(image_id, [])
+            image_status = image.get('status', 'pending')
+            
+            if not annotations and image_status != 'annotated':
+                continue
+            
+            # 已标注图片都应生成标签文件；负样本生成空txt
+            filename = os.path.splitext(image['filename'])[0] + '.txt'
+            label_file = os.path.join(labels_dir, filename)
+            
+            # 先在内存中拼好整个标签文件，一次写入
+            lines = []
+            for ann in annotations:
+                ann_type = ann.get('type', 'bbox')
+                
+                if ann_type == 'bbox':
+                    # YOLO格式：class_id x_center y_center width height（零面积框为空串，跳过）
+                    line = next(bbox_lines)
+                    if line:
+                        lines.append(line)
+                    continue
+                
+                point_key = self._SEGMENT_POINT_KEYS.get(ann_type)
+                if point_key is None:
+                    continue
+                
+                # YOLO分割格式：class_id x1 y1 x2 y2 ... xn yn
+                points = ann.get('data', {}).get(point_key, [])
+                if not points:
+                    continue
+                
+                # 计算归一化系数（每个多边形只算一次倒数，逐点用乘法）
+                inv_width = 1.0 / image.get('width', 1920)  # 默认宽度
+                inv_height = 1.0 / image.get('height', 1080)  # 默认高度
+                
+                # 构建归一化的多边形坐标
+                normalized_points = []
+                for point in points:
+                    if isinstance(point, dict):
+                        x = point.get('x', 0)
+                        y = point.get('y', 0)
+                    elif isinstance(point, (list, tuple)) and len(point) >= 2:
+                        x, y = point[0], point[1]
+                    else:
+                        continue
+                    normalized_points.extend([f"{x * inv_width:.6f}", f"{y * inv_height:.6f}"])
+                
+                if normalized_points:
+                    lines.append(f"{ann.get('class_id', 0)} {' '.join(normalized_points)}\n")
+            
+            with open(label_file, 'w', encoding='utf-8') as f:
+                f.write(''.join(lines))
+            
+            exported_count += 1
+            # 按实际写出的内容统计：只有零面积框的图片同样是空标签
+            if not lines:
+                negative_count += 1
+        
+        return exported_count, negative_count
+    
+    def _export_annotations(self) -> Optional[str]:
+        """导出标注文件，返回成功提示"""
+        # 创建导出目录结构
+        export_path = os.path.join(self.export_dir, f"{self.project_name}_annotations")
+        os.makedirs(export_path, exist_ok=True)
+        
+        # 获取项目图片
+        images = db.get_project_images(self.project_id)
+        if not images:
+            self.export_finished.emit(False, "项目中没有图片")
+            return None
+        
+        # 一次查询取回项目的全部标注，按图片分组
+        annotations_by_image = db.get_project_annotations(self.project_id)
+        
+        if self.export_format == "YOLO格式":
+            # 创建labels目录
+            labels_dir = os.path.join(export_path, 'labels')
+            os.makedirs(labels_dir, exist_ok=True)
+            
+            # 导出每个图片的标注
+            exported_count, negative_count = self._write_yolo_labels(
+                images, labels_dir, annotations_by_image
+            )
+            
+            # 创建classes.txt文件
+            classes_file = os.path.join(export_path, 'classes.txt')
+            Path(classes_file).write_text(
+                ''.join(f"{cls['name']}\n" for cls in self.classes), encoding='utf-8'
+            )
+            
+            return (
+                f"已导出 {exported_count} 个标注文件到\n{export_path}\n\n"
+                f"- 负样本空标签: {negative_count} 个"
+            )
+            
+        elif self.export_format == "COCO格式":
+            # 导出COCO格式
+            import json
+            
+            # 创建COCO格式的标注数据
+            coco_data = {
+                "info": {
+                    "description": f"Annotations for {self.project_name}",
+                    "version": "1.0",
+                    "year": 2024
+                },
+                "licenses": [],
+                "images": [],
+                "annotations": [],
+                "categories": []
+            }
+            
+            # 添加类别
+            for cls in self.classes:
+                coco_data["categories"].append({
+                    "id": cls['id'],
+                    "name": cls['name'],
+                    "supercategory": "object"
+                })
+            
+            # 添加图片和标注
+            annotation_id = 1
+            for image in images:
+                # 添加图片信息
+                image_info = {
+                    "id": image['id'],
+                    "file_name": image['filename'],
+                    "width": image.get('width', 1920),
+                    "height": image.get('height', 1080),
+                    "date_captured": "",
+                    "license": 0,
+                    "coco_url": "",
+                    "flickr_url": ""
+                }
+                coco_data["images"].append(image_info)
+                
+                # 添加标注
+                annotations = annotations_by_image.get(image['id'], [])
+                for ann in annotations:
+                    ann_type = ann.get('type', 'bbox')
+                    data = ann.get('data', {})
+                    
+                    if ann_type == 'bbox':
+                        # COCO格式：x y width height
+                        x = int(data.get('x', 0))
+                        y = int(data.get('y', 0))
+                        width = int(data.get('width', 0))
+                        height = int(data.get('height', 0))
+                        
+                        coco_annotation = {
+                            "id": annotation_id,
+                            "image_id": image['id'],
+                            "category_id": ann.get('class_id', 0),
+                            "segmentation": [],
+                            "area": width * height,
+                            "bbox": [x, y, width, height],
+                            "iscrowd": 0
+                        }
+                        coco_data["annotations"].append(coco_annotation)
+                        annotation_id += 1
+            
+            # 保存COCO格式文件（安装了orjson时用其C实现直接序列化为UTF-8字节，输出格式相同）
+            coco_file = os.path.join(export_path, 'annotations.json')
+            try:
+                import orjson
+            except ImportError:
+                orjson = None
+            if orjson is not None:
+                with open(coco_file, 'wb') as f:
+                    f.write(orjson.dumps(coco_data, option=orjson.OPT_INDENT_2))
+            else:
+                with open(coco_file, 'w', encoding='utf-8') as f:
+                    json.dump(coco_data, f, indent=2, ensure_ascii=False)
+            
+            return f"已导出 COCO 格式标注到\n{coco_file}"
+    
+    def _export_dataset(self) -> Optional[str]:
+        """导出完整数据集（YOLO格式），返回成功提示"""
+        # 创建导出目录结构
+        dataset_dir = os.path.join(self.export_dir, self.project_name)
+        os.makedirs(dataset_dir, exist_ok=True)
+        
+        # 创建images和labels目录
+        images_dir = os.path.join(dataset_dir, 'images')
+        labels_dir = os.path.join(dataset_dir, 'labels')
+        os.makedirs(images_dir, exist_ok=True)
+        os.makedirs(labels_dir, exist_ok=True)
+        
+        # 获取项目图片
+        images = db.get_project_images(self.project_id)
+        if not images:
+            self.export_finished.emit(False, "项目中没有图片")
+            return None
+        
+        # 一次查询取回项目的全部标注，按图片分组
+        annotations_by_image = db.get_project_annotations(self.project_id)
+        
+        # 先收集需要复制的图片，再用线程池并行复制（缺失的源文件在复制时跳过）。
+        # 不同图片可能同名，按目标路径去重并保留最后一个，与顺序复制时后者覆盖前者一致，
+        # 避免多个线程同时写同一个文件
+        copy_pairs_by_dst = {}
+        for image in images:
+            if image.get('storage_path', ''):
+                dst = os.path.join(images_dir, image['filename'])
+                copy_pairs_by_dst[dst] = (image['storage_path'], dst)
+        copy_pairs = list(copy_pairs_by_dst.values())
+        copied_count = copy_files_parallel(
+            copy_pairs,
+            lambda done: self._report_progress(done, len(copy_pairs), "正在复制图片...")
+        )
+        
+        # 导出标注
+        exported_count, negative_count = self._write_yolo_labels(
+            images, labels_dir, annotations_by_image
+        )
+        
+        # 创建classes.txt文件
+        classes_file = os.path.join(dataset_dir, 'classes.txt')
+        Path(classes_file).write_text(
+            ''.join(f"{cls['name']}\n" for cls in self.classes), encoding='utf-8'
+        )
+        
+        # 创建data.yaml文件（YOLO格式）
+        import yaml
+        
+        yaml_file = os.path.join(dataset_dir, 'data.yaml')
+        yaml_content = yaml.safe_dump(
+            {
+                'train': 'images',
+                'test': 'images',
+                'val': 'images',
+                'nc': len(self.classes),
+                'names': [cls['name'] for cls in self.classes],
+            },
+            allow_unicode=True,
+            default_flow_style=False,
+            sort_keys=False,
+        )
+        Path(yaml_file).write_text(yaml_content, encoding='utf-8')
+        
+        return (
+            f"已导出完整数据集到\n{dataset_dir}\n\n"
+            f"- 复制图片: {copied_count} 张\n"
+            f"- 导出标注: {exported_count} 个\n"
+            f"- 负样本空标签: {negative_count} 个"
+        )
+
+
 class AnnotationCanvas(QFrame):
     """标注画布组件"""
     
@@ -479,11 +1215,15 @@ class AnnotationCanvas(QFrame):
         # 图像数据
         self.current_image = None
         self.current_image_path = None
+        # 缩放后图像缓存
+        self._scaled_cache = None
+        self._last_scaled_size = None
         self.image_scale = 1.0
         self.image_offset = QPoint(0, 0)
         
         # 标注数据
         self.annotations = []  # 当前图像的所有标注
+        self._annotations_by_id = {}  # 标注ID -> 标注
         self.selected_annotation_id = None
         self.current_tool = 'rectangle'  # rectangle, polygon, move
         self.drawing = False
@@ -527,9 +1267,13 @@ class AnnotationCanvas(QFrame):
         # 当前悬停的多边形顶点 (annotation_id, vertex_index) / None
         self.hover_vertex = None
         
-        # 类别颜色（动态获取）
+        # 类别颜色（类别ID -> QColor，由页面统一构建并共享，绘制时不再解析颜色字符串）
         self.class_colors = {}
         
+        # 命中检测索引：与self.annotations逐行对应的外接矩形数组 (N, 4) = x0, y0, x1, y1
+        self._hit_bboxes = np.empty((0, 4), dtype=np.float64)
+        self._hit_bboxes_dirty = True
+        
         # 当前选中的类别ID
         self.current_class_id = 0
         
@@ -554,6 +1298,13 @@ class AnnotationCanvas(QFrame):
         self.memory_display_points = []  # [{"x": x, "y": y, "obj_id": id}, ...]
         self.memory_display_bboxes = []  # [{"x1": x1, "y1": y1, "x2": x2, "y2": y2, "obj_id": id}, ...]
         
+        # 重绘合并：鼠标移动频率远高于屏幕刷新率，同一轮事件循环只重绘一次
+        self._paint_pending = False
+        
+        # 快捷键缓存（设置变更后由reload_shortcuts刷新）
+        self._reset_view_key = "R"
+        self.reload_shortcuts()
+        
         self.init_ui()
     
     def init_ui(self):
@@ -570,23 +1321,32 @@ class AnnotationCanvas(QFrame):
         self.setMouseTracking(True)
         self.setFocusPolicy(Qt.FocusPolicy.StrongFocus)
     
+    def reload_shortcuts(self):
+        """从设置中重新读取画布快捷键"""
+        settings = get_settings()
+        self._reset_view_key = str(settings.value("reset_view_shortcut", "R")).upper()
+    
     def load_image(self, image_path: str):
         """加载图像"""
         if not image_path or not os.path.exists(image_path):
             self.current_image = None
             self.current_image_path = None
+            self._scaled_cache = None
             self.update()
             return
         
         # 使用OpenCV加载图像
         img = cv2.imread(image_path)
         if img is not None:
-            img = cv2.cvtColor(img, cv2.COLOR_BGR2RGB)
+            # 直接以BGR888格式引用连续内存，省去颜色转换和一次整图拷贝；
+            # QPixmap.fromImage 会复制像素，局部数组只需在构建期间存活
+            img = np.ascontiguousarray(img)
             h, w, ch = img.shape
             bytes_per_line = ch * w
-            qt_image = QImage(img.data, w, h, bytes_per_line, QImage.Format.Format_RGB888)
+            qt_image = QImage(img.data, w, h, bytes_per_line, QImage.Format.Format_BGR888)
             self.current_image = QPixmap.fromImage(qt_image)
             self.current_image_path = image_path
+            self._scaled_cache = None
             
             # 重置视图
             self.reset_view()
@@ -615,9 +1375,31 @@ class AnnotationCanvas(QFrame):
         )
     
     def set_annotations(self, annotations: List[Dict]):
-        """设置标注数据"""
+        """设置标注数据（多边形顶点在此一次性转为缓存数组，后续命中检测和绘制不再解析字典）"""
+        for annotation in annotations:
+            if annotation.get('type') == 'polygon':
+                get_polygon_array(annotation)
         self.annotations = annotations
+        self._annotations_by_id = {ann['id']: ann for ann in annotations}
         self.selected_annotation_id = None
+        self._hit_bboxes_dirty = True
+        self.update()
+    
+    def add_annotation(self, annotation: Dict):
+        """追加一条已保存的标注（与页面共用同一个标注列表，原地追加）"""
+        self.annotations.append(annotation)
+        self._annotations_by_id[annotation['id']] = annotation
+        self._hit_bboxes_dirty = True
+        self.update()
+    
+    def remove_annotation(self, annotation_id: int):
+        """移除一条标注（原地修改共用的标注列表）"""
+        if self._annotations_by_id.pop(annotation_id, None) is None:
+            return
+        self.annotations[:] = [ann for ann in self.annotations if ann['id'] != annotation_id]
+        if self.selected_annotation_id == annotation_id:
+            self.selected_annotation_id = None
+        self._hit_bboxes_dirty = True
         self.update()
     
     def set_tool(self, tool: str):
@@ -661,6 +1443,26 @@ class AnnotationCanvas(QFrame):
         img_y = (y - self.image_offset.y()) / self.image_scale
         return (img_x, img_y)
     
+    def widget_to_image_batch(self, xy: np.ndarray) -> np.ndarray:
+        """批量将控件坐标 (N, 2) 转换为图像坐标"""
+        return (np.asarray(xy, dtype=np.float64) - (self.image_offset.x(), self.image_offset.y())) / self.image_scale
+    
+    def image_to_widget_batch(self, xy: np.ndarray) -> np.ndarray:
+        """批量将图像坐标 (N, 2) 转换为控件坐标（与image_to_widget一样截断为整数）"""
+        coords = np.asarray(xy, dtype=np.float64) * self.image_scale + (self.image_offset.x(), self.image_offset.y())
+        return coords.astype(np.int32)
+    
+    def _schedule_update(self):
+        """合并重绘请求，下一轮事件循环统一刷新"""
+        if not self._paint_pending:
+            self._paint_pending = True
+            QTimer.singleShot(0, self._do_update)
+    
+    def _do_update(self):
+        """执行合并后的重绘"""
+        self._paint_pending = False
+        self.update()
+    
     def paintEvent(self, event):
         """绘制事件"""
         painter = QPainter(self)
@@ -676,14 +1478,19 @@ class AnnotationCanvas(QFrame):
             painter.drawText(self.rect(), Qt.AlignmentFlag.AlignCenter, "请选择一张图片开始标注")
             return
         
-        # 绘制图像
-        scaled_pixmap = self.current_image.scaled(
+        # 绘制图像（缩放比例未变时复用上次的缩放结果，平移时无需重新缩放）
+        target_size = QSize(
             int(self.current_image.width() * self.image_scale),
-            int(self.current_image.height() * self.image_scale),
-            Qt.AspectRatioMode.KeepAspectRatio,
-            Qt.TransformationMode.SmoothTransformation
+            int(self.current_image.height() * self.image_scale)
         )
-        painter.drawPixmap(self.image_offset, scaled_pixmap)
+        if self._scaled_cache is None or target_size != self._last_scaled_size:
+            self._scaled_cache = self.current_image.scaled(
+                target_size,
+                Qt.AspectRatioMode.KeepAspectRatio,
+                Qt.TransformationMode.SmoothTransformation
+            )
+            self._last_scaled_size = target_size
+        painter.drawPixmap(self.image_offset, self._scaled_cache)
         
         # 绘制标注
         self.draw_annotations(painter)
@@ -849,9 +1656,7 @@ class AnnotationCanvas(QFrame):
             class_id = annotation.get('class_id', 0)
             
             # 获取颜色（优先从class_colors字典，否则使用默认灰色）
-            color = self.class_colors.get(class_id, QColor(128, 128, 128))
-            if isinstance(color, str):
-                color = QColor(color)
+            color = self.class_colors.get(class_id, DEFAULT_CLASS_QCOLOR)
             
             # 如果是选中的标注，使用高亮颜色
             is_selected = (ann_id == self.selected_annotation_id)
@@ -868,7 +1673,7 @@ class AnnotationCanvas(QFrame):
             if ann_type == 'bbox':
                 self.draw_bbox(painter, data, is_selected)
             elif ann_type == 'polygon':
-                self.draw_polygon(painter, data, is_selected)
+                self.draw_polygon(painter, annotation, is_selected)
             elif ann_type == 'keypoint':
                 self.draw_keypoints(painter, data, is_selected)
             elif ann_type == 'obb':
@@ -891,22 +1696,16 @@ class AnnotationCanvas(QFrame):
         if is_selected:
             self.draw_resize_handles(painter, rect)
     
-    def draw_polygon(self, painter: QPainter, data: Dict, is_selected: bool):
-        """绘制多边形"""
-        points = data.get('points', [])
-        if len(points) < 3:
+    def draw_polygon(self, painter: QPainter, annotation: Dict, is_selected: bool):
+        """绘制多边形（基于标注上缓存的顶点数组批量转换坐标）"""
+        poly = self._get_polygon_array(annotation)
+        if poly is None:
             return
         
-        widget_points = []
-        for point in points:
-            widget_point = self.image_to_widget(point['x'], point['y'])
-            widget_points.append(widget_point)
+        widget_points = [QPoint(x, y) for x, y in self.image_to_widget_batch(poly).tolist()]
         
-        # 绘制多边形
-        for i in range(len(widget_points)):
-            p1 = widget_points[i]
-            p2 = widget_points[(i + 1) % len(widget_points)]
-            painter.drawLine(p1, p2)
+        # 绘制多边形（画刷为NoBrush，只描边）
+        painter.drawPolygon(QPolygon(widget_points))
         
         # 绘制顶点
         for point in widget_points:
@@ -1329,7 +2128,7 @@ class AnnotationCanvas(QFrame):
                     self.resize_handle = handle_info['handle']
                     self.selected_annotation_id = handle_info['annotation_id']
                     # 获取选中的标注数据
-                    annotation = next((ann for ann in self.annotations if ann['id'] == self.selected_annotation_id), None)
+                    annotation = self._annotations_by_id.get(self.selected_annotation_id)
                     if annotation:
                         self.drag_start = event.pos()
                         self.resize_start_rect = annotation['data'].copy()
@@ -1384,7 +2183,7 @@ class AnnotationCanvas(QFrame):
         # SAM模式：更新框绘制
         if self.sam_mode_active and self.sam_drawing_bbox:
             self.sam_current_point = event.pos()
-            self.update()
+            self._schedule_update()
             return
         
         # 多边形标注：添加初始点吸附效果
@@ -1400,17 +2199,17 @@ class AnnotationCanvas(QFrame):
             self.current_point = event.pos()
         
         if self.drawing and self.current_tool == 'rectangle':
-            self.update()
+            self._schedule_update()
         elif self.current_tool == 'polygon':
-            self.update()
+            self._schedule_update()
         elif self.current_tool == 'move':
             if self.resizing and self.resize_handle and self.resize_start_rect:
                 # 调整大小
                 self.resize_annotation(event.pos())
-                self.update()
+                self._schedule_update()
             elif self.dragging_vertex and self.selected_annotation_id is not None:
                 # 拖动多边形的某个顶点
-                annotation = next((ann for ann in self.annotations if ann['id'] == self.selected_annotation_id), None)
+                annotation = self._annotations_by_id.get(self.selected_annotation_id)
                 if annotation and annotation.get('type') == 'polygon':
                     points = annotation.get('data', {}).get('points', [])
                     idx = self.drag_vertex_index
@@ -1423,11 +2222,12 @@ class AnnotationCanvas(QFrame):
                             img_y = max(0, min(img_y, img_h))
                         points[idx]['x'] = img_x
                         points[idx]['y'] = img_y
-                self.update()
+                        self._invalidate_hit_cache(annotation)
+                self._schedule_update()
             elif self.dragging and self.drag_start and self.drag_start_annotation:
                 # 拖动标注
                 self.drag_annotation(event.pos())
-                self.update()
+                self._schedule_update()
             elif self.panning and self.pan_start and self.pan_start_offset:
                 # 平移图片
                 delta = event.pos() - self.pan_start
@@ -1435,7 +2235,7 @@ class AnnotationCanvas(QFrame):
                     self.pan_start_offset.x() + delta.x(),
                     self.pan_start_offset.y() + delta.y()
                 )
-                self.update()
+                self._schedule_update()
             else:
                 # 检查鼠标是否在手柄上，改变光标
                 handle_info = self.get_resize_handle_at(event.pos())
@@ -1472,7 +2272,7 @@ class AnnotationCanvas(QFrame):
             img_x, img_y = self.widget_to_image(event.pos().x(), event.pos().y())
         
         # 触发重绘以显示辅助线
-        self.update()
+        self._schedule_update()
     
     def mouseReleaseEvent(self, event: QMouseEvent):
         """鼠标释放事件"""
@@ -1507,7 +2307,7 @@ class AnnotationCanvas(QFrame):
                 self.resize_start_rect = None
                 # 发送修改信号
                 if self.selected_annotation_id is not None:
-                    annotation = next((ann for ann in self.annotations if ann['id'] == self.selected_annotation_id), None)
+                    annotation = self._annotations_by_id.get(self.selected_annotation_id)
                     if annotation:
                         self.annotation_modified.emit(self.selected_annotation_id, annotation['data'])
             elif self.dragging_vertex:
@@ -1516,7 +2316,7 @@ class AnnotationCanvas(QFrame):
                 self.drag_start = None
                 # 发送修改信号
                 if self.selected_annotation_id is not None:
-                    annotation = next((ann for ann in self.annotations if ann['id'] == self.selected_annotation_id), None)
+                    annotation = self._annotations_by_id.get(self.selected_annotation_id)
                     if annotation:
                         self.annotation_modified.emit(self.selected_annotation_id, annotation['data'])
             elif self.dragging:
@@ -1525,7 +2325,7 @@ class AnnotationCanvas(QFrame):
                 self.drag_start_annotation = None
                 # 发送修改信号
                 if self.selected_annotation_id is not None:
-                    annotation = next((ann for ann in self.annotations if ann['id'] == self.selected_annotation_id), None)
+                    annotation = self._annotations_by_id.get(self.selected_annotation_id)
                     if annotation:
                         self.annotation_modified.emit(self.selected_annotation_id, annotation['data'])
             elif self.panning:
@@ -1547,58 +2347,50 @@ class AnnotationCanvas(QFrame):
     
     def get_annotation_at(self, pos: QPoint) -> Optional[Dict]:
         """获取指定位置的标注"""
-        for annotation in reversed(self.annotations):
+        for annotation in self._iter_hit_candidates(pos):
             if self.is_point_in_annotation(pos, annotation):
                 return annotation
         return None
 
-    def get_polygon_vertex_at(self, pos: QPoint, annotation: Dict) -> Optional[int]:
-        """如果pos命中多边形顶点，返回顶点索引，否则None（控件坐标判定）"""
+    def _polygon_vertex_distances(self, pos: QPoint, annotation: Dict) -> Optional[np.ndarray]:
+        """pos到多边形各顶点的曼哈顿距离（控件坐标，基于缓存的顶点数组一次批量换算）"""
         if not annotation or annotation.get('type') != 'polygon':
             return None
-        data = annotation.get('data', {})
-        points = data.get('points', [])
-        if not points:
-            return None
+        poly = self._get_polygon_array(annotation)
+        if poly is None:
+            # 少于3个顶点时不缓存，直接换算
+            points = annotation.get('data', {}).get('points', [])
+            if not points:
+                return None
+            poly = np.array([(pt['x'], pt['y']) for pt in points], dtype=np.float32)
+        widget_points = self.image_to_widget_batch(poly)
+        return np.abs(widget_points - (pos.x(), pos.y())).sum(axis=1)
 
-        for idx, pt in enumerate(points):
-            if not isinstance(pt, dict) or 'x' not in pt or 'y' not in pt:
-                continue
-            wp = self.image_to_widget(pt['x'], pt['y'])
-            if (pos - wp).manhattanLength() <= self.vertex_hit_radius:
-                return idx
-        return None
+    def get_polygon_vertex_at(self, pos: QPoint, annotation: Dict) -> Optional[int]:
+        """如果pos命中多边形顶点，返回顶点索引，否则None（控件坐标判定）"""
+        distances = self._polygon_vertex_distances(pos, annotation)
+        if distances is None:
+            return None
+        hits = np.flatnonzero(distances <= self.vertex_hit_radius)
+        return int(hits[0]) if hits.size else None
 
     def get_nearest_polygon_vertex_at(self, pos: QPoint, annotation: Dict, radius: int) -> Optional[int]:
         """返回radius范围内最近的多边形顶点索引（控件坐标），否则None。
 
         用于提供轻微“磁吸/辅助命中”，让用户更容易选中顶点。
         """
-        if not annotation or annotation.get('type') != 'polygon':
+        distances = self._polygon_vertex_distances(pos, annotation)
+        if distances is None:
             return None
-        data = annotation.get('data', {})
-        points = data.get('points', [])
-        if not points:
-            return None
-
-        best_idx = None
-        best_dist = None
-        for idx, pt in enumerate(points):
-            if not isinstance(pt, dict) or 'x' not in pt or 'y' not in pt:
-                continue
-            wp = self.image_to_widget(pt['x'], pt['y'])
-            d = (pos - wp).manhattanLength()
-            if d <= radius and (best_dist is None or d < best_dist):
-                best_dist = d
-                best_idx = idx
-        return best_idx
+        best_idx = int(np.argmin(distances))
+        return best_idx if distances[best_idx] <= radius else None
     
     def get_resize_handle_at(self, pos: QPoint) -> Optional[Dict]:
         """获取指定位置的调整手柄信息"""
         if self.selected_annotation_id is None:
             return None
         
-        annotation = next((ann for ann in self.annotations if ann['id'] == self.selected_annotation_id), None)
+        annotation = self._annotations_by_id.get(self.selected_annotation_id)
         if not annotation or annotation.get('type') != 'bbox':
             return None
         
@@ -1632,7 +2424,7 @@ class AnnotationCanvas(QFrame):
         if self.drag_start is None or self.drag_start_annotation is None:
             return
         
-        annotation = next((ann for ann in self.annotations if ann['id'] == self.selected_annotation_id), None)
+        annotation = self._annotations_by_id.get(self.selected_annotation_id)
         if not annotation:
             return
         
@@ -1646,6 +2438,7 @@ class AnnotationCanvas(QFrame):
         
         ann_type = annotation.get('type', 'bbox')
         data = annotation['data']
+        self._invalidate_hit_cache(annotation)
         
         # 获取图像尺寸
         img_width = self.current_image.width() if self.current_image else 0
@@ -1701,12 +2494,13 @@ class AnnotationCanvas(QFrame):
         if self.resize_handle is None or self.resize_start_rect is None:
             return
         
-        annotation = next((ann for ann in self.annotations if ann['id'] == self.selected_annotation_id), None)
+        annotation = self._annotations_by_id.get(self.selected_annotation_id)
         if not annotation:
             return
         
         data = annotation['data']
         start = self.resize_start_rect
+        self._invalidate_hit_cache(annotation)
         
         # 将鼠标位置转换为图像坐标
         img_x, img_y = self.widget_to_image(pos.x(), pos.y())
@@ -1794,91 +2588,96 @@ class AnnotationCanvas(QFrame):
     
     def keyPressEvent(self, event: QKeyEvent):
         """键盘事件"""
-        from PyQt6.QtCore import QSettings
-        
-        # 获取快捷键设置
-        settings = QSettings("EzYOLO", "Settings")
-        reset_view_key = settings.value("reset_view_shortcut", "R").upper()
-        
         # 重置视图快捷键
-        if event.text().upper() == reset_view_key:
+        if event.text().upper() == self._reset_view_key:
             self.reset_view()
-            self.update()
+            self._schedule_update()
             return
         
-        if event.key() == Qt.Key.Key_Escape:
-            # SAM模式：退出SAM模式
-            if self.sam_mode_active:
-                self.sam_mode_active = False
-                self.sam_points = []
-                self.sam_bboxes = []
-                self.sam_drawing_bbox = False
-                self.set_tool('rectangle')  # 切换回默认工具
-                self.update()
-                return
-            # 取消当前操作
-            if self.current_tool == 'polygon' and len(self.polygon_points) > 0:
-                self.polygon_points = []
-                self.update()
-            elif self.drawing:
-                self.drawing = False
-                self.update()
-        elif event.key() == Qt.Key.Key_Return or event.key() == Qt.Key.Key_Enter:
-            # 完成多边形绘制
-            if self.current_tool == 'polygon' and len(self.polygon_points) >= 3:
-                self.create_polygon_annotation()
-        elif event.key() == Qt.Key.Key_Delete:
-            # 删除选中的标注
-            if self.selected_annotation_id is not None:
-                self.annotation_deleted.emit(self.selected_annotation_id)
+        handler = self._key_handlers.get(event.key())
+        if handler is not None:
+            handler(self)
         else:
             # 将未处理的事件传递给父组件
             self.parent().keyPressEvent(event)
     
-    def check_annotation_selection(self, pos: QPoint):
-        """检查是否选中了某个标注"""
-        for annotation in reversed(self.annotations):  # 从后往前检查，先检查上面的
-            if self.is_point_in_annotation(pos, annotation):
-                self.selected_annotation_id = annotation['id']
-                self.annotation_selected.emit(annotation['id'])
-                self.update()
+    def _on_key_escape(self):
+        """Esc：退出SAM模式或取消当前绘制"""
+        # SAM模式：退出SAM模式
+        if self.sam_mode_active:
+            self.sam_mode_active = False
+            self.sam_points = []
+            self.sam_bboxes = []
+            self.sam_drawing_bbox = False
+            self.set_tool('rectangle')  # 切换回默认工具
+            self._schedule_update()
+            return
+        # 取消当前操作
+        if self.current_tool == 'polygon' and len(self.polygon_points) > 0:
+            self.polygon_points = []
+            self._schedule_update()
+        elif self.drawing:
+            self.drawing = False
+            self._schedule_update()
+    
+    def _on_key_finish_polygon(self):
+        """回车：完成多边形绘制"""
+        if self.current_tool == 'polygon' and len(self.polygon_points) >= 3:
+            self.create_polygon_annotation()
+    
+    def _on_key_delete(self):
+        """Delete：删除选中的标注"""
+        if self.selected_annotation_id is not None:
+            self.annotation_deleted.emit(self.selected_annotation_id)
+    
+    # 按键 -> 处理函数
+    _key_handlers = {
+        Qt.Key.Key_Escape: _on_key_escape,
+        Qt.Key.Key_Return: _on_key_finish_polygon,
+        Qt.Key.Key_Enter: _on_key_finish_polygon,
+        Qt.Key.Key_Delete: _on_key_delete,
+    }
+    
+    def check_annotation_selection(self, pos: QPoint):
+        """检查是否选中了某个标注"""
+        for annotation in self._iter_hit_candidates(pos):  # 从后往前检查，先检查上面的
+            if self.is_point_in_annotation(pos, annotation):
+                self.selected_annotation_id = annotation['id']
+                self.annotation_selected.emit(annotation['id'])
+                self._schedule_update()
                 return
         
         # 没有选中任何标注
         self.selected_annotation_id = None
-        self.update()
+        self._schedule_update()
     
     def is_point_in_annotation(self, pos: QPoint, annotation: Dict) -> bool:
-        """检查点是否在标注内"""
+        """检查点是否在标注内（查询点只转换一次，在图像坐标系中判定）"""
         ann_type = annotation.get('type', 'bbox')
         data = annotation.get('data', {})
+        qx, qy = self.widget_to_image(pos.x(), pos.y())
         
         if ann_type == 'bbox':
             x = data.get('x', 0)
             y = data.get('y', 0)
-            width = data.get('width', 0)
-            height = data.get('height', 0)
-            
-            top_left = self.image_to_widget(x, y)
-            bottom_right = self.image_to_widget(x + width, y + height)
-            
-            return (top_left.x() <= pos.x() <= bottom_right.x() and
-                    top_left.y() <= pos.y() <= bottom_right.y())
+            return (x <= qx <= x + data.get('width', 0) and
+                    y <= qy <= y + data.get('height', 0))
         
         elif ann_type == 'polygon':
             # 简化的多边形检测
-            points = data.get('points', [])
-            if len(points) < 3:
+            poly = self._get_polygon_array(annotation)
+            if poly is None:
                 return False
             
-            # 转换为控件坐标
-            widget_points = []
-            for point in points:
-                widget_point = self.image_to_widget(point['x'], point['y'])
-                widget_points.append((widget_point.x(), widget_point.y()))
+            # 外接矩形快速排除，绝大多数远离的多边形无需射线检测
+            x_min, y_min, x_max, y_max = annotation['_poly_bbox']
+            if not (x_min <= qx <= x_max and y_min <= qy <= y_max):
+                return False
             
-            # 使用射线法检测点是否在多边形内
-            return self.point_in_polygon(pos.x(), pos.y(), widget_points)
+            path = get_polygon_path(annotation)
+            if path is not None:
+                return bool(path.contains_point((qx, qy)))
+            return self.point_in_polygon(qx, qy, poly)
         elif ann_type == 'obb':
             # 计算OBB的四个顶点
             x = data.get('x', 0)
@@ -1887,64 +2686,108 @@ class AnnotationCanvas(QFrame):
             height = data.get('height', 0)
             angle = data.get('angle', 0)
             
-            # 转换为控件坐标的四个顶点
-            widget_points = []
+            # 图像坐标下的四个顶点
+            vertices = []
             for i in range(4):
                 vertex_angle = angle + i * math.pi / 2
                 vertex_x = x + width * math.cos(vertex_angle) - height * math.sin(vertex_angle)
                 vertex_y = y + width * math.sin(vertex_angle) + height * math.cos(vertex_angle)
-                widget_point = self.image_to_widget(vertex_x, vertex_y)
-                widget_points.append((widget_point.x(), widget_point.y()))
+                vertices.append((vertex_x, vertex_y))
             
             # 使用射线法检测点是否在OBB内
-            return self.point_in_polygon(pos.x(), pos.y(), widget_points)
+            return self.point_in_polygon(qx, qy, vertices)
         elif ann_type == 'keypoint':
-            # 检查是否点击了任何一个关键点
+            # 检查是否点击了任何一个关键点（10像素控件距离换算到图像坐标）
+            hit_radius = 10 / self.image_scale
+            hit_radius_sq = hit_radius * hit_radius
             keypoints = data.get('keypoints', [])
             for kp in keypoints:
-                kp_x = kp.get('x', 0)
-                kp_y = kp.get('y', 0)
-                # 转换为控件坐标
-                widget_kp = self.image_to_widget(kp_x, kp_y)
-                # 计算鼠标位置与关键点的距离
-                distance = math.sqrt((pos.x() - widget_kp.x()) ** 2 + (pos.y() - widget_kp.y()) ** 2)
-                # 设置阈值，10像素范围内视为点击了关键点
-                if distance <= 10:
+                dx = qx - kp.get('x', 0)
+                dy = qy - kp.get('y', 0)
+                if dx * dx + dy * dy <= hit_radius_sq:
                     return True
         
         return False
     
-    def point_in_polygon(self, x: int, y: int, polygon: List[Tuple[int, int]]) -> bool:
-        """射线法判断点是否在多边形内"""
-        n = len(polygon)
-        inside = False
-        p1x, p1y = polygon[0]
-        for i in range(1, n + 1):
-            p2x, p2y = polygon[i % n]
-            if y > min(p1y, p2y):
-                if y <= max(p1y, p2y):
-                    if x <= max(p1x, p2x):
-                        if p1y != p2y:
-                            xinters = (y - p1y) * (p2x - p1x) / (p2y - p1y) + p1x
-                        if p1x == p2x or x <= xinters:
-                            inside = not inside
-            p1x, p1y = p2x, p2y
-        return inside
+    def _get_polygon_array(self, annotation: Dict) -> Optional[np.ndarray]:
+        """获取多边形顶点数组（图像坐标，缓存在标注上，编辑后需失效）"""
+        return get_polygon_array(annotation)
+    
+    def _invalidate_hit_cache(self, annotation: Dict):
+        """标注几何被修改后清除命中检测缓存"""
+        annotation.pop('_poly_np', None)
+        annotation.pop('_poly_bbox', None)
+        annotation.pop('_poly_path', None)
+        self._hit_bboxes_dirty = True
+    
+    def _get_annotation_bbox(self, annotation: Dict) -> Optional[Tuple[float, float, float, float]]:
+        """获取标注在图像坐标下的外接矩形，无法确定时返回None"""
+        ann_type = annotation.get('type', 'bbox')
+        data = annotation.get('data', {})
+        if ann_type == 'bbox':
+            x = data.get('x', 0)
+            y = data.get('y', 0)
+            return (x, y, x + data.get('width', 0), y + data.get('height', 0))
+        if ann_type == 'polygon':
+            if self._get_polygon_array(annotation) is None:
+                return None
+            return annotation['_poly_bbox']
+        if ann_type == 'obb':
+            # 顶点到中心的距离恒为 hypot(width, height)
+            radius = math.hypot(data.get('width', 0), data.get('height', 0))
+            x = data.get('x', 0)
+            y = data.get('y', 0)
+            return (x - radius, y - radius, x + radius, y + radius)
+        # 关键点的命中半径随缩放变化，不做索引
+        return None
+    
+    def _rebuild_hit_bboxes(self):
+        """重建外接矩形数组；无固定外接矩形的标注（如关键点）使用无穷范围，始终作为候选"""
+        bboxes = np.empty((len(self.annotations), 4), dtype=np.float64)
+        unbounded = (-np.inf, -np.inf, np.inf, np.inf)
+        for index, annotation in enumerate(self.annotations):
+            bbox = self._get_annotation_bbox(annotation)
+            bboxes[index] = unbounded if bbox is None else bbox
+        self._hit_bboxes = bboxes
+        self._hit_bboxes_dirty = False
+    
+    def _iter_hit_candidates(self, pos: QPoint):
+        """按从上到下的顺序返回外接矩形包含pos的标注（一次向量化筛选）"""
+        if self._hit_bboxes_dirty:
+            self._rebuild_hit_bboxes()
+        qx, qy = self.widget_to_image(pos.x(), pos.y())
+        bboxes = self._hit_bboxes
+        mask = (
+            (bboxes[:, 0] <= qx) & (qx <= bboxes[:, 2]) &
+            (bboxes[:, 1] <= qy) & (qy <= bboxes[:, 3])
+        )
+        annotations = self.annotations
+        for index in np.flatnonzero(mask)[::-1]:
+            yield annotations[index]
+    
+    def point_in_polygon(self, x: float, y: float, polygon) -> bool:
+        """射线法判断点是否在多边形内（用于OBB，以及matplotlib不可用时的多边形备用判定）"""
+        return bool(points_in_polygon(np.array([[x, y]], dtype=np.float64), polygon)[0])
     
     def create_rectangle_annotation(self):
         """创建矩形标注"""
         if self.start_point is None or self.current_point is None:
             return
         
-        # 转换为图像坐标
-        x1, y1 = self.widget_to_image(self.start_point.x(), self.start_point.y())
-        x2, y2 = self.widget_to_image(self.current_point.x(), self.current_point.y())
+        # 图像空间尺寸 = 控件空间尺寸 / image_scale，且裁剪只会缩小，
+        # 控件空间已不足 5 * image_scale 的框必然会被下面的尺寸过滤丢弃
+        min_widget_size = 5 * self.image_scale
+        if (abs(self.current_point.x() - self.start_point.x()) < min_widget_size or
+                abs(self.current_point.y() - self.start_point.y()) < min_widget_size):
+            return
         
-        # 确保 x1 < x2, y1 < y2
-        x = min(x1, x2)
-        y = min(y1, y2)
-        width = abs(x2 - x1)
-        height = abs(y2 - y1)
+        # 转换为图像坐标，并确保 x1 < x2, y1 < y2
+        corners = self.widget_to_image_batch([
+            (self.start_point.x(), self.start_point.y()),
+            (self.current_point.x(), self.current_point.y()),
+        ])
+        x, y = corners.min(axis=0).tolist()
+        width, height = np.ptp(corners, axis=0).tolist()
         
         # 限制坐标在图像范围内
         if self.current_image:
@@ -1983,19 +2826,14 @@ class AnnotationCanvas(QFrame):
         if len(self.polygon_points) < 3:
             return
         
-        # 转换为图像坐标
-        points = []
-        for point in self.polygon_points:
-            x, y = self.widget_to_image(point.x(), point.y())
-            
-            # 限制坐标在图像范围内
-            if self.current_image:
-                img_width = self.current_image.width()
-                img_height = self.current_image.height()
-                x = max(0, min(x, img_width))
-                y = max(0, min(y, img_height))
-            
-            points.append({'x': x, 'y': y})
+        # 批量转换为图像坐标
+        coords = self.widget_to_image_batch([(point.x(), point.y()) for point in self.polygon_points])
+        
+        # 限制坐标在图像范围内
+        if self.current_image:
+            np.clip(coords, 0, (self.current_image.width(), self.current_image.height()), out=coords)
+        
+        points = [{'x': x, 'y': y} for x, y in coords.tolist()]
         
         annotation = {
             'type': 'polygon',
@@ -2238,11 +3076,24 @@ class AnnotatePage(QWidget):
         self.current_image_data = None
         self.images = []
         self.annotations = []
+        self._images_by_id = {}  # 图片ID -> 图片数据
+        self._image_index_by_id = {}  # 图片ID -> 在self.images中的下标
+        self._annotations_by_id = {}  # 标注ID -> 标注
         self.classes = []
+        self._class_by_id = {}  # 类别ID -> 类别信息，由update_class_list重建
+        self._sorted_classes = []  # 按类别ID排序的类别列表，供导出使用，由update_class_list重建
+        self._qcolor_by_class_id = {}  # 类别ID -> QColor，与画布共享，由update_class_list重建
+        self._class_list_items_by_id = {}  # 类别ID -> 类别列表项，用于单个类别的增量更新
         self.current_class_id = 0
-        self.history = []  # 撤销历史
+        self.history = deque(maxlen=MAX_HISTORY_SIZE)  # 撤销历史
         self.history_index = -1
         self.load_worker = None  # 加载线程
+        self.annotation_save_workers = []  # 推理结果写入线程
+        self.single_inference_worker = None  # 单张推理线程
+        self.export_worker = None  # 导出线程
+        self.export_progress = None  # 导出进度对话框
+        self.image_items = {}  # 图片ID -> 列表项
+        self._items_by_status = {}  # 图片状态 -> {图片ID: 列表项}，筛选时按组切换可见性
         self.random_delete_worker = None
         self.random_delete_progress = None
         self._sample_stats_project_id = None
@@ -2312,17 +3163,38 @@ class AnnotatePage(QWidget):
         self.next_image_shortcut.setContext(Qt.ShortcutContext.WidgetWithChildrenShortcut)
         self.next_image_shortcut.activated.connect(self._trigger_next_image_shortcut)
 
+        # 按住翻页键时的节流：冷却期内只记录目标图片，到时再加载最后一张
+        self._pending_nav_image_id = None
+        self._image_nav_timer = QTimer(self)
+        self._image_nav_timer.setSingleShot(True)
+        self._image_nav_timer.setInterval(IMAGE_NAV_THROTTLE_MS)
+        self._image_nav_timer.timeout.connect(self._flush_pending_image_navigation)
+
         self._refresh_navigation_shortcuts()
 
     def _refresh_navigation_shortcuts(self):
-        """读取设置中的翻页快捷键。"""
-        from PyQt6.QtCore import QSettings
-
-        settings = QSettings("EzYOLO", "Settings")
-        prev_image_key = str(settings.value("prev_image_shortcut", "A")).upper()
-        next_image_key = str(settings.value("next_image_shortcut", "D")).upper()
-        self.prev_image_shortcut.setKey(QKeySequence(prev_image_key))
-        self.next_image_shortcut.setKey(QKeySequence(next_image_key))
+        """读取设置中的翻页和工具快捷键并缓存（页面显示时刷新，按键时不再读取QSettings）。"""
+        settings = get_settings()
+        self._shortcuts = {
+            'prev_image': str(settings.value("prev_image_shortcut", "A")).upper(),
+            'next_image': str(settings.value("next_image_shortcut", "D")).upper(),
+            'rect': str(settings.value("rect_tool_shortcut", "W")).upper(),
+            'poly': str(settings.value("poly_tool_shortcut", "P")).upper(),
+            'move': str(settings.value("move_tool_shortcut", "V")).upper(),
+            'delete': str(settings.value("delete_shortcut", "DELETE")).upper(),
+        }
+        # 按键文本 -> 处理函数；按优先级从低到高写入，快捷键重复时与原判断顺序一致
+        self._key_dispatch = {}
+        for name, handler in (
+            ('delete', self._on_shortcut_delete),
+            ('move', self._on_shortcut_move),
+            ('poly', self._on_shortcut_poly),
+            ('rect', self._on_shortcut_rect),
+        ):
+            self._key_dispatch[self._shortcuts[name]] = handler
+        self.prev_image_shortcut.setKey(QKeySequence(self._shortcuts['prev_image']))
+        self.next_image_shortcut.setKey(QKeySequence(self._shortcuts['next_image']))
+        self.canvas.reload_shortcuts()
 
     def _should_handle_navigation_shortcut(self) -> bool:
         """在当前焦点状态下是否允许触发翻页快捷键。"""
@@ -2345,24 +3217,55 @@ class AnnotatePage(QWidget):
     def _trigger_prev_image_shortcut(self):
         """上一张快捷键入口。"""
         if self._should_handle_navigation_shortcut():
-            self.prev_image()
+            self._navigate_image_throttled(-1)
 
     def _trigger_next_image_shortcut(self):
         """下一张快捷键入口。"""
         if self._should_handle_navigation_shortcut():
-            self.next_image()
+            self._navigate_image_throttled(1)
+
+    def _navigate_image_throttled(self, step: int):
+        """快捷键翻页：首次按键立即加载，按键连发时合并为冷却结束后的一次加载。"""
+        base_id = self._pending_nav_image_id
+        if base_id is None:
+            base_id = self.current_image_id
+        if not self.images or not base_id:
+            return
+
+        index = self._image_index_by_id.get(base_id)
+        if index is None:
+            return
+        new_index = index + step
+        if new_index < 0 or new_index >= len(self.images):
+            return
+        new_image_id = self.images[new_index]['id']
+
+        if self._image_nav_timer.isActive():
+            # 冷却期内只移动列表高亮，不读数据库、不重绘画布
+            self._pending_nav_image_id = new_image_id
+            item = self.image_items.get(new_image_id)
+            if item is not None:
+                self.image_list.setCurrentItem(item)
+                self.image_list.scrollToItem(item)
+        else:
+            self.load_image(new_image_id)
+            self._image_nav_timer.start()
+
+    def _flush_pending_image_navigation(self):
+        """冷却结束：加载连发期间最后停留的图片。"""
+        image_id = self._pending_nav_image_id
+        self._pending_nav_image_id = None
+        if image_id is None or image_id == self.current_image_id or image_id not in self._images_by_id:
+            return
+        self.load_image(image_id)
+        self._image_nav_timer.start()
 
     def create_left_panel(self) -> QWidget:
         """创建左侧面板 - 图片列表"""
         panel = QFrame()
         panel.setFrameStyle(QFrame.Shape.StyledPanel)
         panel.setMaximumWidth(300)
-        panel.setStyleSheet(f"""
-            QFrame {{
-                background-color: {COLORS['panel']};
-                border-right: 1px solid {COLORS['border']};
-            }}
-        """)
+        panel.setStyleSheet(_LEFT_PANEL_QSS)
         
         layout = QVBoxLayout(panel)
         layout.setContentsMargins(8, 8, 8, 8)
@@ -2393,24 +3296,12 @@ class AnnotatePage(QWidget):
         
         # 图片列表
         self.image_list = QListWidget()
-        self.image_list.setIconSize(QSize(80, 80))
+        self.image_list.setIconSize(QSize(THUMBNAIL_SIZE, THUMBNAIL_SIZE))
+        QPixmapCache.setCacheLimit(max(QPixmapCache.cacheLimit(), THUMBNAIL_CACHE_LIMIT_KB))
+        self.image_list.setItemDelegate(ThumbnailItemDelegate(self.image_list))
         self.image_list.setSpacing(4)
         self.image_list.itemClicked.connect(self.on_image_selected)
-        self.image_list.setStyleSheet(f"""
-            QListWidget {{
-                background-color: {COLORS['sidebar']};
-                border: 1px solid {COLORS['border']};
-                border-radius: 4px;
-            }}
-            QListWidget::item {{
-                background-color: {COLORS['panel']};
-                border-radius: 4px;
-                padding: 4px;
-            }}
-            QListWidget::item:selected {{
-                background-color: {COLORS['primary']};
-            }}
-        """)
+        self.image_list.setStyleSheet(_IMAGE_LIST_QSS)
         layout.addWidget(self.image_list)
         
         # 导航按钮
@@ -2454,13 +3345,7 @@ class AnnotatePage(QWidget):
     def create_toolbar(self) -> QWidget:
         """创建工具栏"""
         toolbar = QFrame()
-        toolbar.setStyleSheet(f"""
-            QFrame {{
-                background-color: {COLORS['panel']};
-                border: 1px solid {COLORS['border']};
-                border-radius: 6px;
-            }}
-        """)
+        toolbar.setStyleSheet(_TOOLBAR_QSS)
         toolbar_layout = QHBoxLayout(toolbar)
         toolbar_layout.setContentsMargins(6, 3, 6, 3)
         toolbar_layout.setSpacing(14)
@@ -2795,12 +3680,7 @@ class AnnotatePage(QWidget):
         panel = QFrame()
         panel.setFrameStyle(QFrame.Shape.StyledPanel)
         panel.setMaximumWidth(300)
-        panel.setStyleSheet(f"""
-            QFrame {{
-                background-color: {COLORS['panel']};
-                border-left: 1px solid {COLORS['border']};
-            }}
-        """)
+        panel.setStyleSheet(_RIGHT_PANEL_QSS)
         
         layout = QVBoxLayout(panel)
         layout.setContentsMargins(8, 8, 8, 8)
@@ -2808,37 +3688,11 @@ class AnnotatePage(QWidget):
         
         # 类别列表
         class_group = QGroupBox("类别列表")
-        class_group.setStyleSheet(f"""
-            QGroupBox {{
-                color: {COLORS['text_primary']};
-                font-weight: bold;
-                border: 1px solid {COLORS['border']};
-                border-radius: 4px;
-                margin-top: 8px;
-                padding-top: 8px;
-            }}
-            QGroupBox::title {{
-                subcontrol-origin: margin;
-                left: 8px;
-                padding: 0 4px;
-            }}
-        """)
+        class_group.setStyleSheet(_GROUP_BOX_QSS)
         class_layout = QVBoxLayout(class_group)
         
         self.class_list = QListWidget()
-        self.class_list.setStyleSheet(f"""
-            QListWidget {{
-                background-color: {COLORS['sidebar']};
-                border: 1px solid {COLORS['border']};
-            }}
-            QListWidget::item {{
-                padding: 6px 8px;
-                min-height: 24px;
-            }}
-            QListWidget::item:selected {{
-                background-color: {COLORS['primary']};
-            }}
-        """)
+        self.class_list.setStyleSheet(_CLASS_LIST_QSS)
         self.class_list.setSpacing(2)
         self.class_list.itemClicked.connect(self.on_class_selected)
         self.class_list.setContextMenuPolicy(Qt.ContextMenuPolicy.CustomContextMenu)
@@ -2860,6 +3714,12 @@ class AnnotatePage(QWidget):
         self.btn_add_class.setFixedHeight(compact_action_button_height)
         self.btn_add_class.setSizePolicy(QSizePolicy.Policy.Expanding, QSizePolicy.Policy.Fixed)
         self.btn_add_class.setStyleSheet(compact_action_button_style)
+        self.btn_bulk_add_class = QPushButton("批量添加")
+        self.btn_bulk_add_class.setToolTip("一次添加多个类别，每行一个名称，颜色自动分配")
+        self.btn_bulk_add_class.clicked.connect(self.bulk_add_classes)
+        self.btn_bulk_add_class.setFixedHeight(compact_action_button_height)
+        self.btn_bulk_add_class.setSizePolicy(QSizePolicy.Policy.Expanding, QSizePolicy.Policy.Fixed)
+        self.btn_bulk_add_class.setStyleSheet(compact_action_button_style)
         self.btn_apply_attr = QPushButton("应用修改")
         self.btn_apply_attr.clicked.connect(self.apply_annotation_changes)
         self.btn_apply_attr.setFixedHeight(compact_action_button_height)
@@ -2870,6 +3730,7 @@ class AnnotatePage(QWidget):
         class_button_row.setContentsMargins(0, 0, 0, 0)
         class_button_row.setSpacing(8)
         class_button_row.addWidget(self.btn_add_class, 1)
+        class_button_row.addWidget(self.btn_bulk_add_class, 1)
         class_button_row.addWidget(self.btn_apply_attr, 1)
         class_layout.addLayout(class_button_row)
         
@@ -2877,7 +3738,7 @@ class AnnotatePage(QWidget):
         
         # 标注属性 / 样本调节
         attr_group = QGroupBox("标注属性")
-        attr_group.setStyleSheet(class_group.styleSheet())
+        attr_group.setStyleSheet(_GROUP_BOX_QSS)
         attr_layout = QFormLayout(attr_group)
         attr_layout.setLabelAlignment(Qt.AlignmentFlag.AlignLeft | Qt.AlignmentFlag.AlignVCenter)
         attr_layout.setFormAlignment(Qt.AlignmentFlag.AlignTop)
@@ -2950,7 +3811,7 @@ class AnnotatePage(QWidget):
         
         # 导出功能
         export_group = QGroupBox("数据导出")
-        export_group.setStyleSheet(class_group.styleSheet())
+        export_group.setStyleSheet(_GROUP_BOX_QSS)
         export_layout = QVBoxLayout(export_group)
         
         # 导出格式选择
@@ -3012,17 +3873,7 @@ class AnnotatePage(QWidget):
         status_bar = QFrame()
         status_bar.setFrameStyle(QFrame.Shape.StyledPanel)
         status_bar.setMaximumHeight(40)
-        status_bar.setStyleSheet(f"""
-            QFrame {{
-                background-color: {COLORS['panel']};
-                border-top: 1px solid {COLORS['border']};
-            }}
-            QLabel {{
-                color: {COLORS['text_secondary']};
-                font-size: 12px;
-                padding: 4px 12px;
-            }}
-        """)
+        status_bar.setStyleSheet(_STATUS_BAR_QSS)
         
         layout = QHBoxLayout(status_bar)
         layout.setContentsMargins(8, 4, 8, 4)
@@ -3053,54 +3904,15 @@ class AnnotatePage(QWidget):
         self.current_project_id = project_id
         self._invalidate_sample_stats_cache()
         
+        # 上一次的加载尚未结束时先回收，避免线程和遮罩层被遗弃
+        self._release_project_load_thread()
+        self._hide_project_loading_overlay()
+        
         # 显示加载动画
         self.loading_overlay = LoadingOverlay(self, "正在加载项目数据...")
         self.loading_overlay.show_loading()
         
-        # 创建后台线程来加载项目数据
-        from PyQt6.QtCore import QThread, pyqtSignal
-        
-        class ProjectLoadThread(QThread):
-            """项目数据加载线程"""
-            
-            data_loaded = pyqtSignal(dict)
-            finished = pyqtSignal()
-            
-            def __init__(self, project_id):
-                super().__init__()
-                self.project_id = project_id
-            
-            def run(self):
-                """运行线程"""
-                try:
-                    # 加载项目信息
-                    project = db.get_project(self.project_id)
-                    classes = []
-                    
-                    if project:
-                        # 加载类别
-                        import json
-                        try:
-                            classes = json.loads(project.get('classes', '[]'))
-                        except:
-                            classes = []
-                        
-                        if not classes:
-                            # 添加默认类别
-                            classes = [
-                                {'id': 0, 'name': 'person', 'color': '#FF0000'},
-                                {'id': 1, 'name': 'car', 'color': '#00FF00'}
-                            ]
-                    
-                    # 加载图片列表数据
-                    images = db.get_project_images(self.project_id)
-                    
-                    # 发送加载完成信号
-                    self.data_loaded.emit({'classes': classes, 'images': images})
-                finally:
-                    self.finished.emit()
-        
-        # 创建并启动线程
+        # 创建后台线程加载项目数据
         self.load_thread = ProjectLoadThread(project_id)
         self.load_thread.data_loaded.connect(self.on_project_data_loaded)
         self.load_thread.finished.connect(self.on_project_load_finished)
@@ -3108,12 +3920,16 @@ class AnnotatePage(QWidget):
     
     def on_project_data_loaded(self, data):
         """项目数据加载完成回调"""
+        # 忽略已被替换的旧线程在断开连接前投递的信号
+        if self.sender() is not getattr(self, 'load_thread', None):
+            return
+        
         # 更新类别
         self.classes = data.get('classes', [])
         self.update_class_list()
         
         # 保存图片数据
-        self.images = data.get('images', [])
+        self._set_images(data.get('images', []))
         
         # 设置任务类型选择器
         if self.current_project_id:
@@ -3130,44 +3946,78 @@ class AnnotatePage(QWidget):
     
     def on_project_load_finished(self):
         """项目加载完成回调"""
+        if self.sender() is not getattr(self, 'load_thread', None):
+            return
+        
         # 隐藏加载动画
+        self._hide_project_loading_overlay()
+        
+        # 清理线程
+        self._release_project_load_thread()
+    
+    def _hide_project_loading_overlay(self):
+        """隐藏并释放项目加载遮罩"""
         if hasattr(self, 'loading_overlay'):
             self.loading_overlay.hide_loading()
             self.loading_overlay.deleteLater()
             delattr(self, 'loading_overlay')
-        
-        # 清理线程
-        if hasattr(self, 'load_thread'):
-            self.load_thread.wait()
-            delattr(self, 'load_thread')
+    
+    def _release_project_load_thread(self):
+        """断开并回收项目加载线程"""
+        thread = getattr(self, 'load_thread', None)
+        if thread is None:
+            return
+        thread.data_loaded.disconnect(self.on_project_data_loaded)
+        thread.finished.disconnect(self.on_project_load_finished)
+        # 线程只做两次数据库查询，等待其结束后再释放 C++ 对象
+        thread.wait()
+        thread.deleteLater()
+        delattr(self, 'load_thread')
+    
+    def _release_image_load_worker(self):
+        """停止并回收缩略图加载线程"""
+        worker = self.load_worker
+        if worker is None:
+            return
+        self.load_worker = None
+        worker.stop()
+        worker.image_loaded.disconnect(self.on_image_loaded)
+        worker.finished_loading.disconnect(self.on_load_finished)
+        worker.wait()
+        worker.deleteLater()
     
     def load_image_list(self):
         """加载图片列表 - 使用多线程"""
-        # 停止之前的加载
-        if self.load_worker and self.load_worker.isRunning():
-            self.load_worker.stop()
-            self.load_worker.wait()
+        # 停止并回收之前的加载线程
+        self._release_image_load_worker()
         
         self.image_list.clear()
-        self.images = []
+        self.image_items = {}
+        self._items_by_status = {}
+        self._set_images([])
         
         if not self.current_project_id:
             return
         
         # 从数据库获取图片列表（很快）
-        self.images = db.get_project_images(self.current_project_id)
+        self._set_images(db.get_project_images(self.current_project_id))
         self._invalidate_sample_stats_cache()
         
-        # 先创建所有列表项（显示占位符）
-        for image in self.images:
-            item = QListWidgetItem()
-            item.setData(Qt.ItemDataRole.UserRole, image['id'])
-            
-            # 设置显示文本
-            status_text = "✓" if image.get('status') == 'annotated' else "○"
-            item.setText(f"{status_text} {image['filename']}")
-            
-            self.image_list.addItem(item)
+        # 先创建所有列表项（显示占位符），批量添加期间暂停重绘和信号，结束后只刷新一次
+        filter_text = self.image_filter.currentText()
+        self.image_list.setUpdatesEnabled(False)
+        self.image_list.blockSignals(True)
+        try:
+            for image in self.images:
+                item = QListWidgetItem()
+                item.setData(Qt.ItemDataRole.UserRole, image['id'])
+                item.setData(THUMBNAIL_PATH_ROLE, image.get('storage_path', ''))
+                self.image_list.addItem(item)
+                self.image_items[image['id']] = item
+                self._apply_image_item_status(item, image, filter_text)
+        finally:
+            self.image_list.blockSignals(False)
+            self.image_list.setUpdatesEnabled(True)
         
         self.update_status_bar()
         self.update_sample_control_panel()
@@ -3181,32 +4031,61 @@ class AnnotatePage(QWidget):
     
     def on_image_loaded(self, index: int, pixmap: QPixmap):
         """单个图片加载完成回调"""
+        # 旧线程在断开前已投递的信号对应的是旧列表，索引不可信
+        if self.sender() is not self.load_worker:
+            return
         if index < self.image_list.count():
             item = self.image_list.item(index)
             if item:
-                item.setIcon(QIcon(pixmap))
+                # 缩略图只进入 QPixmapCache，列表项上仅保存缓存键
+                key = f"annotate_thumb_{item.data(Qt.ItemDataRole.UserRole)}"
+                QPixmapCache.insert(key, pixmap)
+                item.setData(THUMBNAIL_KEY_ROLE, key)
     
     def on_load_finished(self):
         """加载完成回调"""
         pass
     
+    @staticmethod
+    def _image_matches_filter(status: str, filter_text: str) -> bool:
+        """图片状态是否符合筛选条件"""
+        if filter_text == "未标注":
+            return status == 'pending'
+        if filter_text == "已标注":
+            return status != 'pending'
+        return True
+    
+    def _apply_image_item_status(self, item: QListWidgetItem, image_data: dict, filter_text: str):
+        """按图片状态刷新列表项文本和筛选可见性"""
+        status = image_data.get('status', 'pending')
+        status_text = "✓" if status == 'annotated' else "○"
+        item.setText(f"{status_text} {image_data['filename']}")
+        item.setHidden(not self._image_matches_filter(status, filter_text))
+        
+        # 状态存在列表项上，并把列表项移到新状态的分组中
+        image_id = image_data['id']
+        previous_status = item.data(IMAGE_STATUS_ROLE)
+        if previous_status is not None and previous_status != status:
+            self._items_by_status.get(previous_status, {}).pop(image_id, None)
+        self._items_by_status.setdefault(status, {})[image_id] = item
+        item.setData(IMAGE_STATUS_ROLE, status)
+    
     def update_image_list_display(self):
-        """更新图片列表显示"""
+        """更新图片列表显示（只刷新状态发生变化的列表项）"""
         # 重新加载图片数据
         if self.current_project_id:
-            self.images = db.get_project_images(self.current_project_id)
+            self._set_images(db.get_project_images(self.current_project_id))
             
-            # 更新图片列表项
-            for i in range(self.image_list.count()):
-                item = self.image_list.item(i)
-                image_id = item.data(Qt.ItemDataRole.UserRole)
-                
-                # 找到对应的图片数据
-                image_data = next((img for img in self.images if img['id'] == image_id), None)
-                if image_data:
-                    # 更新显示文本
-                    status_text = "✓" if image_data.get('status') == 'annotated' else "○"
-                    item.setText(f"{status_text} {image_data['filename']}")
+            filter_text = self.image_filter.currentText()
+            self.image_list.setUpdatesEnabled(False)
+            try:
+                for image_data in self.images:
+                    item = self.image_items.get(image_data['id'])
+                    if item is None or item.data(IMAGE_STATUS_ROLE) == image_data.get('status', 'pending'):
+                        continue
+                    self._apply_image_item_status(item, image_data, filter_text)
+            finally:
+                self.image_list.setUpdatesEnabled(True)
     
     def update_class_list(self):
         """更新类别列表"""
@@ -3214,35 +4093,34 @@ class AnnotatePage(QWidget):
         current_sample_target = self.sample_target_class.currentData()
         current_selected_class = self.current_class_id
         class_sample_counts, negative_sample_count = self._get_sample_stats()
-        self.class_list.clear()
-        self.attr_class.clear()
+        self._class_by_id = {cls['id']: cls for cls in self.classes}
+        self._sorted_classes = sorted(self.classes, key=lambda x: x['id'])
+        self._class_list_items_by_id = {}
+        
+        # 更新canvas的类别颜色（每个类别只构造一次QColor）
+        self._qcolor_by_class_id = {
+            cls['id']: QColor(cls.get('color', '#808080')) for cls in self.classes
+        }
+        self.canvas.class_colors = self._qcolor_by_class_id
+        
+        # 整体重建期间暂停重绘，结束后只刷新一次
+        self.class_list.setUpdatesEnabled(False)
         self.sample_target_class.blockSignals(True)
-        self.sample_target_class.clear()
-        
-        # 更新canvas的类别颜色
-        class_colors = {}
-        for cls in self.classes:
-            class_colors[cls['id']] = cls.get('color', '#808080')
-        self.canvas.class_colors = class_colors
-        
-        for cls in self.classes:
-            sample_count = class_sample_counts.get(cls['id'], 0)
-            # 创建带颜色的列表项
-            item = QListWidgetItem(f"■ {cls['name']} ({sample_count})")
-            item.setData(Qt.ItemDataRole.UserRole, cls['id'])
-            
-            # 设置颜色
-            color = QColor(cls.get('color', '#808080'))
-            item.setForeground(color)
-            item.setSizeHint(QSize(item.sizeHint().width(), 30))
+        try:
+            self.class_list.clear()
+            self.attr_class.clear()
+            self.sample_target_class.clear()
             
-            self.class_list.addItem(item)
+            for cls in self.classes:
+                self._add_class_list_item(cls, class_sample_counts.get(cls['id'], 0))
+                
+                # 添加到属性面板的下拉框
+                self.attr_class.addItem(cls['name'], cls['id'])
+                self.sample_target_class.addItem(cls['name'], cls['id'])
             
-            # 添加到属性面板的下拉框
-            self.attr_class.addItem(cls['name'], cls['id'])
-            self.sample_target_class.addItem(cls['name'], cls['id'])
-
-        self.sample_target_class.addItem("负样本", NEGATIVE_SAMPLE_CLASS_ID)
+            self.sample_target_class.addItem("负样本", NEGATIVE_SAMPLE_CLASS_ID)
+        finally:
+            self.class_list.setUpdatesEnabled(True)
 
         if current_attr_class is not None:
             attr_index = self.attr_class.findData(current_attr_class)
@@ -3269,6 +4147,58 @@ class AnnotatePage(QWidget):
             self.class_list.setCurrentRow(selected_row)
             self.on_class_selected()
 
+    def _add_class_list_item(self, cls: Dict, sample_count: int):
+        """在类别列表末尾添加一个带颜色的列表项"""
+        item = QListWidgetItem(f"■ {cls['name']} ({sample_count})")
+        item.setData(Qt.ItemDataRole.UserRole, cls['id'])
+        
+        # 设置颜色
+        item.setForeground(self._qcolor_by_class_id[cls['id']])
+        item.setSizeHint(QSize(item.sizeHint().width(), 30))
+        
+        self.class_list.addItem(item)
+        self._class_list_items_by_id[cls['id']] = item
+
+    def append_class_items(self, new_classes: List[Dict]):
+        """把已追加到 self.classes 的新类别增量加入列表和下拉框，不重建整个类别列表"""
+        class_sample_counts, _ = self._get_sample_stats()
+        self._sorted_classes = sorted(self.classes, key=lambda x: x['id'])
+        
+        self.sample_target_class.blockSignals(True)
+        try:
+            for cls in new_classes:
+                self._class_by_id[cls['id']] = cls
+                self._qcolor_by_class_id[cls['id']] = QColor(cls.get('color', '#808080'))
+                self._add_class_list_item(cls, class_sample_counts.get(cls['id'], 0))
+                self.attr_class.addItem(cls['name'], cls['id'])
+                # “负样本”始终保持在最后
+                self.sample_target_class.insertItem(
+                    self.sample_target_class.count() - 1, cls['name'], cls['id']
+                )
+        finally:
+            self.sample_target_class.blockSignals(False)
+
+    def update_class_item(self, class_id: int):
+        """类别名称或颜色修改后，原地刷新对应的列表项、下拉框和画布颜色"""
+        cls = self._class_by_id.get(class_id)
+        item = self._class_list_items_by_id.get(class_id)
+        if cls is None or item is None:
+            self.update_class_list()
+            return
+        
+        color = QColor(cls.get('color', '#808080'))
+        self._qcolor_by_class_id[class_id] = color
+        class_sample_counts, _ = self._get_sample_stats()
+        item.setText(f"■ {cls['name']} ({class_sample_counts.get(class_id, 0)})")
+        item.setForeground(color)
+        
+        for combo in (self.attr_class, self.sample_target_class):
+            index = combo.findData(class_id)
+            if index >= 0:
+                combo.setItemText(index, cls['name'])
+        
+        self.canvas.update()
+
     def get_sample_target_images(self, target_class_id):
         """获取指定标签对应的样本图像列表"""
         if not self.current_project_id or target_class_id is None:
@@ -3334,13 +4264,11 @@ class AnnotatePage(QWidget):
             self._refresh_annotation_class_controls()
             return
 
-        for row in range(self.class_list.count()):
-            item = self.class_list.item(row)
-            if item and item.data(Qt.ItemDataRole.UserRole) == class_id:
-                self.class_list.setCurrentRow(row)
-                self.current_class_id = class_id
-                self.canvas.current_class_id = class_id
-                break
+        item = self._class_list_items_by_id.get(class_id)
+        if item is not None:
+            self.class_list.setCurrentItem(item)
+            self.current_class_id = class_id
+            self.canvas.current_class_id = class_id
 
         self._sync_attr_class_combo_from_list()
         self._refresh_annotation_class_controls()
@@ -3364,7 +4292,7 @@ class AnnotatePage(QWidget):
             self.btn_apply_attr.setEnabled(False)
             return
 
-        annotation = next((ann for ann in self.annotations if ann['id'] == selected_annotation_id), None)
+        annotation = self._annotations_by_id.get(selected_annotation_id)
         if annotation is None:
             self.btn_apply_attr.setEnabled(False)
             return
@@ -3384,7 +4312,7 @@ class AnnotatePage(QWidget):
             if not item:
                 continue
             class_id = item.data(Qt.ItemDataRole.UserRole)
-            class_info = next((cls for cls in self.classes if cls['id'] == class_id), None)
+            class_info = self._class_by_id.get(class_id)
             if not class_info:
                 continue
             sample_count = class_sample_counts.get(class_id, 0)
@@ -3427,6 +4355,10 @@ class AnnotatePage(QWidget):
     
     def init_auto_label_components(self):
         """初始化自动标注组件"""
+        # 模型管理依赖 ultralytics/torch，推迟到首次使用自动标注时再导入
+        from core.auto_labeler import BatchLabelingManager
+        from core.model_manager import ModelManager
+        
         if not self.model_manager:
             self.model_manager = ModelManager()
         
@@ -3440,56 +4372,29 @@ class AnnotatePage(QWidget):
             self.batch_labeling_manager.progress_updated.connect(self.on_batch_inference_progress)
             self.batch_labeling_manager.batch_completed.connect(self.on_batch_inference_completed)
         
-        # 初始化加载动画
-        if not hasattr(self, 'loading_label'):
-            self.loading_label = QLabel("加载中...")
-            self.loading_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
-            self.loading_label.setStyleSheet("""
-                QLabel {
-                    background-color: rgba(0, 0, 0, 0.7);
-                    color: white;
-                    font-size: 16px;
-                    font-weight: bold;
-                    padding: 20px;
-                    border-radius: 8px;
-                }
-            """)
-            self.loading_label.hide()
-            # 将加载动画添加到主布局
-            self.main_layout.addWidget(self.loading_label)
-            self.loading_label.setGeometry(
-                self.width() // 2 - 100,
-                self.height() // 2 - 50,
-                200,
-                100
-            )
-            self.loading_label.raise_()
+        # 初始化加载动画（自带定时器驱动的旋转动画，无需手动重绘）
+        if not hasattr(self, 'inference_overlay'):
+            self.inference_overlay = LoadingOverlay(self, "加载中...")
     
     def show_loading_animation(self, message):
         """显示加载动画"""
-        if not hasattr(self, 'loading_label'):
+        if not hasattr(self, 'inference_overlay'):
             self.init_auto_label_components()
         
-        self.loading_label.setText(message)
-        self.loading_label.setGeometry(
-            self.width() // 2 - 150,
-            self.height() // 2 - 50,
-            300,
-            100
-        )
-        self.loading_label.show()
-        self.loading_label.raise_()
-        # 强制刷新界面
-        self.repaint()
+        self.inference_overlay.show_loading(message)
     
     def hide_loading_animation(self):
         """隐藏加载动画"""
-        if hasattr(self, 'loading_label'):
-            self.loading_label.hide()
+        if hasattr(self, 'inference_overlay'):
+            self.inference_overlay.hide_loading()
     
     def show_auto_label_settings(self):
         """显示自动标注设置对话框"""
+        # 弹窗在会话内复用，仅在再次打开时恢复已保存的状态
+        reuse_dialog = self.auto_label_dialog is not None
         self.init_auto_label_components()
+        if reuse_dialog:
+            self.auto_label_dialog.reset_state()
         self.auto_label_dialog.set_classes(self.classes)
         
         # 显示对话框
@@ -3534,11 +4439,7 @@ class AnnotatePage(QWidget):
             return
         
         # 获取当前图片路径
-        current_image = None
-        for img in self.images:
-            if img['id'] == self.current_image_id:
-                current_image = img
-                break
+        current_image = self._images_by_id.get(self.current_image_id)
         
         if not current_image:
             QMessageBox.warning(self, "提示", "无法获取当前图片信息")
@@ -3583,10 +4484,8 @@ class AnnotatePage(QWidget):
     def _get_current_image_path(self) -> str:
         if not self.current_image_id:
             return ""
-        for img in self.images:
-            if img['id'] == self.current_image_id:
-                return img.get('storage_path', '')
-        return ""
+        current_image = self._images_by_id.get(self.current_image_id)
+        return current_image.get('storage_path', '') if current_image else ""
 
     def _prepare_memory_mode_context(self):
         if not self.current_project_id:
@@ -3917,7 +4816,7 @@ class AnnotatePage(QWidget):
             QMessageBox.warning(self, "提示", "请先执行“更新记忆”并保存至少一个对象")
             return
 
-        start_idx = next((i for i, img in enumerate(self.images) if img.get("id") == self.current_image_id), -1)
+        start_idx = self._image_index_by_id.get(self.current_image_id, -1)
         if start_idx < 0:
             QMessageBox.warning(self, "提示", "未找到当前图片在列表中的位置")
             return
@@ -4073,10 +4972,25 @@ class AnnotatePage(QWidget):
         progress.setWindowModality(Qt.WindowModality.WindowModal)
         progress.show()
         
+        # 选择的像素点一次性转为 (M, 2) 数组，供批量几何判定
+        points_arr = np.asarray(points, dtype=np.float64).reshape(-1, 2)
+        
+        # 操作类型在整个批次中不变：删除按目标类别筛选，修改按源类别筛选
+        if operation == 'delete':
+            selected_classes = set(config.get('target_classes', []))
+        else:
+            selected_classes = set(config.get('source_classes', []))
+        
         processed_count = 0
         modified_count = 0
+        matched_ids = []
         
         try:
+            # 一次查询取回范围内所有图片的标注
+            annotations_by_image = db.get_annotations_for_images(
+                [image_data['id'] for image_data in images_to_process]
+            )
+            
             for i, image_data in enumerate(images_to_process):
                 if progress.wasCanceled():
                     break
@@ -4084,49 +4998,31 @@ class AnnotatePage(QWidget):
                 progress.setValue(i)
                 progress.setLabelText(f"正在处理第 {i+1}/{len(images_to_process)} 张图片...")
                 
-                image_id = image_data['id']
-                annotations = db.get_image_annotations(image_id)
+                annotations = annotations_by_image[image_data['id']]
                 
                 if not annotations:
                     continue
                 
-                # 检查每个标注是否覆盖选择的像素点
-                for annotation in annotations:
-                    annotation_data = annotation.get('data', {})
-                    annotation_type = annotation.get('type', 'bbox')
-                    
-                    # 检查标注是否覆盖任何选择的像素点
-                    covers_point = False
-                    for point in points:
-                        px, py = point
-                        if self.is_point_in_annotation_data(px, py, annotation_data, annotation_type):
-                            covers_point = True
-                            break
-                    
-                    if covers_point:
-                        if operation == 'delete':
-                            # 批量删除：检查类别是否在目标类别列表中
-                            target_classes = config.get('target_classes', [])
-                            if annotation.get('class_id') in target_classes:
-                                db.delete_annotation(annotation['id'])
-                                modified_count += 1
-                        else:
-                            # 批量修改：检查类别是否在源类别列表中
-                            source_classes = config.get('source_classes', [])
-                            target_class = config.get('target_class')
-                            if annotation.get('class_id') in source_classes:
-                                target_class_info = next(
-                                    (cls for cls in self.classes if cls['id'] == target_class),
-                                    None
-                                )
-                                db.update_annotation(
-                                    annotation['id'],
-                                    class_id=target_class,
-                                    class_name=target_class_info['name'] if target_class_info else None
-                                )
-                                modified_count += 1
-                
                 processed_count += 1
+                
+                # 先按类别筛选（廉价），只对候选标注做几何判定，命中的标注ID先收集起来
+                candidates = [ann for ann in annotations if ann.get('class_id') in selected_classes]
+                if candidates:
+                    matched_ids.extend(
+                        ann['id'] for ann in self.annotations_covering_points(points_arr, candidates)
+                    )
+            
+            # 扫描结束后在单个事务中统一写入数据库
+            if operation == 'delete':
+                modified_count = db.delete_annotations(matched_ids)
+            else:
+                target_class = config.get('target_class')
+                target_class_info = self._class_by_id.get(target_class)
+                modified_count = db.update_annotations_class(
+                    matched_ids,
+                    class_id=target_class,
+                    class_name=target_class_info['name'] if target_class_info else None
+                )
             
             progress.setValue(len(images_to_process))
             
@@ -4146,47 +5042,69 @@ class AnnotatePage(QWidget):
         except Exception as e:
             QMessageBox.critical(self, "错误", f"批量处理出错: {str(e)}")
     
-    def is_point_in_annotation_data(self, px: int, py: int, data: dict, ann_type: str) -> bool:
-        """检查点是否在标注数据内"""
+    def annotations_covering_points(self, points: np.ndarray, annotations: List[Dict]) -> List[Dict]:
+        """返回覆盖任意一个点的标注
+        
+        同一张图片的矩形框一起组成 (K, 4) 数组，与 (M, 2) 的点做一次无分支广播判定；
+        其余类型逐个交给 annotation_covers_points。
+        """
+        covered = []
+        box_annotations = []
+        boxes = []
+        for annotation in annotations:
+            if annotation.get('type', 'bbox') == 'bbox':
+                data = annotation.get('data', {})
+                x = data.get('x', 0)
+                y = data.get('y', 0)
+                boxes.append((x, y, x + data.get('width', 0), y + data.get('height', 0)))
+                box_annotations.append(annotation)
+            elif self.annotation_covers_points(points, annotation):
+                covered.append(annotation)
+        
+        if boxes:
+            bounds = np.asarray(boxes, dtype=np.float64)[:, :, None]
+            px = points[:, 0]
+            py = points[:, 1]
+            hits = ((px >= bounds[:, 0]) & (px <= bounds[:, 2]) &
+                    (py >= bounds[:, 1]) & (py <= bounds[:, 3])).any(axis=1)
+            covered.extend(ann for ann, hit in zip(box_annotations, hits.tolist()) if hit)
+        return covered
+    
+    def annotation_covers_points(self, points: np.ndarray, annotation: dict) -> bool:
+        """检查标注是否覆盖任意一个点（points为(M, 2)数组，一次向量化判定）"""
+        data = annotation.get('data', {})
+        ann_type = annotation.get('type', 'bbox')
         if ann_type == 'bbox':
             x = data.get('x', 0)
             y = data.get('y', 0)
             width = data.get('width', 0)
             height = data.get('height', 0)
-            return x <= px <= x + width and y <= py <= y + height
+            px = points[:, 0]
+            py = points[:, 1]
+            return bool(((px >= x) & (px <= x + width) & (py >= y) & (py <= y + height)).any())
         elif ann_type == 'polygon':
-            points = data.get('points', [])
-            if len(points) < 3:
+            poly = get_polygon_array(annotation)
+            if poly is None:
+                return False
+            # 先用外接框过滤，只对落在框内的点做射线法判定
+            x_min, y_min, x_max, y_max = annotation['_poly_bbox']
+            px = points[:, 0]
+            py = points[:, 1]
+            in_bbox = (px >= x_min) & (px <= x_max) & (py >= y_min) & (py <= y_max)
+            if not in_bbox.any():
                 return False
-            # 使用射线法判断点是否在多边形内
-            return self.point_in_polygon(px, py, points)
+            return bool(polygon_contains_points(annotation, points[in_bbox]).any())
         return False
     
-    def point_in_polygon(self, x: int, y: int, polygon: list) -> bool:
-        """射线法判断点是否在多边形内"""
-        n = len(polygon)
-        inside = False
-        p1x, p1y = polygon[0]['x'], polygon[0]['y']
-        for i in range(1, n + 1):
-            p2x, p2y = polygon[i % n]['x'], polygon[i % n]['y']
-            if y > min(p1y, p2y):
-                if y <= max(p1y, p2y):
-                    if x <= max(p1x, p2x):
-                        if p1y != p2y:
-                            xinters = (y - p1y) * (p2x - p1x) / (p2y - p1y) + p1x
-                        if p1x == p2x or x <= xinters:
-                            inside = not inside
-            p1x, p1y = p2x, p2y
-        return inside
-    
     def run_single_inference(self):
         """运行单张图像推理"""
         if not self.current_image_data:
             QMessageBox.warning(self, "提示", "请先选择一张图片")
             return
         
-        # 显示加载动画
-        self.show_loading_animation("正在进行单张推理...")
+        if self.single_inference_worker is not None:
+            QMessageBox.information(self, "提示", "正在推理中，请稍候")
+            return
         
         # 使用保存的参数或默认参数运行推理
         try:
@@ -4213,8 +5131,9 @@ class AnnotatePage(QWidget):
             # 使用process_single_image方法，支持model_task
             labeler = AutoLabeler(model_path, self.model_manager)
             
-            # 加载模型配置
+            # 模型配置（加载在推理线程中进行）
             import re
+            load_config = None
             match = re.match(r'(yolov)(\d+)([a-z])', model_path)
             if match:
                 version_num = match.group(2)
@@ -4227,7 +5146,6 @@ class AnnotatePage(QWidget):
                     'model_task': model_task,  # 使用保存的任务类型
                     'class_mappings': class_mapping
                 }
-                labeler.load_model(load_config)
             else:
                 # 自定义模型
                 if os.path.exists(model_path):
@@ -4240,7 +5158,6 @@ class AnnotatePage(QWidget):
                         'custom_model_path': model_path,
                         'class_mappings': class_mapping
                     }
-                    labeler.load_model(load_config)
             
             # 处理图像
             config = {
@@ -4248,67 +5165,15 @@ class AnnotatePage(QWidget):
                 'iou_threshold': iou_threshold,
                 'class_mappings': class_mapping
             }
-            annotations = labeler.process_single_image(
-                self.current_image_data['storage_path'], 
-                self.current_image_id,
-                config
+            self.start_single_inference(
+                labeler,
+                (lambda: labeler.load_model(load_config)) if load_config else None,
+                self.current_image_data['storage_path'],
+                config,
+                overwrite_labels
             )
-            
-            # 更新当前图像的标注
-            if annotations and self.current_image_id:
-                # 保存标注到数据库
-                # 如果需要覆盖原标签，先删除所有原标注
-                if overwrite_labels:
-                    db.delete_image_annotations(self.current_image_id)
-                
-                for annotation in annotations:
-                    # 获取类别名称
-                    class_id = annotation['class_id']
-                    
-                    # 检查类别ID是否在项目类别范围内
-                    existing_class = next((cls for cls in self.classes if cls['id'] == class_id), None)
-                    if existing_class:
-                        class_name = existing_class['name']
-                    else:
-                        # 创建新类别
-                        class_name = f"class_{class_id}"
-                        # 生成随机颜色
-                        import random
-                        color = f"#{random.randint(0, 0xFFFFFF):06x}"
-                        new_class = {
-                            'id': class_id,
-                            'name': class_name,
-                            'color': color
-                        }
-                        self.classes.append(new_class)
-                        # 更新项目类别
-                        db.update_project(self.current_project_id, classes=self.classes)
-                    
-                    # 保存标注
-                    db.add_annotation(
-                        self.current_image_id,
-                        self.current_project_id,
-                        class_id,
-                        class_name,
-                        annotation['type'],
-                        annotation['data']
-                    )
-                
-                # 重新加载当前图像的标注
-                self.load_current_image_annotations()
-                
-                QMessageBox.information(self, "成功", "自动标注完成！")
-            else:
-                # 如果没有检测到目标，但需要覆盖原标签，也删除原标注
-                if overwrite_labels and self.current_image_id:
-                    db.delete_image_annotations(self.current_image_id)
-                    self.load_current_image_annotations()
-                QMessageBox.information(self, "提示", "未检测到目标")
         except Exception as e:
             QMessageBox.critical(self, "错误", f"自动标注失败: {str(e)}")
-        finally:
-            # 隐藏加载动画
-            self.hide_loading_animation()
     
     def run_batch_inference(self):
         """运行批量推理"""
@@ -4366,11 +5231,16 @@ class AnnotatePage(QWidget):
         """单张推理请求回调"""
         from core.auto_labeler import AutoLabeler
         
+        if self.single_inference_worker is not None:
+            QMessageBox.information(self, "提示", "正在推理中，请稍候")
+            return
+        
         try:
             labeler = AutoLabeler(model_path, self.model_manager)
             
-            # 加载模型，指定任务类型
+            # 模型加载函数，指定任务类型（在推理线程中执行）
             import re
+            load_model = None
             match = re.match(r'(yolov)(\d+)([a-z])', model_path)
             if match:
                 version_num = match.group(2)
@@ -4383,11 +5253,12 @@ class AnnotatePage(QWidget):
                     'model_task': model_task,
                     'class_mappings': class_mapping
                 }
-                labeler.load_model(load_config)
+                load_model = lambda: labeler.load_model(load_config)
             else:
                 # 自定义模型
                 if os.path.exists(model_path):
-                    labeler.current_model = self.model_manager.load_custom_model(model_path)
+                    def load_model():
+                        labeler.current_model = self.model_manager.load_custom_model(model_path)
             
             # 处理图像
             config = {
@@ -4395,66 +5266,120 @@ class AnnotatePage(QWidget):
                 'iou_threshold': iou_threshold,
                 'class_mappings': class_mapping
             }
-            annotations = labeler.process_single_image(image_path, self.current_image_id, config)
             
             # 获取覆盖标签设置
             overwrite_labels = False
             if hasattr(self, 'auto_label_settings'):
                 overwrite_labels = self.auto_label_settings.get('overwrite_labels', False)
             
-            # 更新当前图像的标注
-            if annotations and self.current_image_id:
-                # 保存标注到数据库
-                # 如果需要覆盖原标签，先删除所有原标注
-                if overwrite_labels:
-                    db.delete_image_annotations(self.current_image_id)
-                
-                for annotation in annotations:
-                    # 获取类别名称
-                    class_id = annotation['class_id']
-                    
-                    # 检查类别ID是否在项目类别范围内
-                    existing_class = next((cls for cls in self.classes if cls['id'] == class_id), None)
-                    if existing_class:
-                        class_name = existing_class['name']
-                    else:
-                        # 创建新类别
-                        class_name = f"class_{class_id}"
-                        # 生成随机颜色
-                        import random
-                        color = f"#{random.randint(0, 0xFFFFFF):06x}"
-                        new_class = {
-                            'id': class_id,
-                            'name': class_name,
-                            'color': color
-                        }
-                        self.classes.append(new_class)
-                        # 更新项目类别
-                        db.update_project(self.current_project_id, classes=self.classes)
-                    
-                    # 保存标注
-                    db.add_annotation(
-                        self.current_image_id,
-                        self.current_project_id,
-                        class_id,
-                        class_name,
-                        annotation['type'],
-                        annotation['data']
-                    )
-                
-                # 重新加载当前图像的标注
-                self.load_current_image_annotations()
-                
-                QMessageBox.information(self, "成功", "自动标注完成！")
+            self.start_single_inference(labeler, load_model, image_path, config, overwrite_labels)
+        except Exception as e:
+            QMessageBox.critical(self, "错误", f"自动标注失败: {str(e)}")
+    
+    def start_single_inference(self, labeler, load_model, image_path: str, config: Dict, overwrite_labels: bool):
+        """在后台线程中加载模型并推理当前图片，结果通过信号回到界面线程"""
+        # 显示加载动画
+        self.show_loading_animation("正在进行单张推理...")
+        
+        worker = SingleInferenceWorker(
+            labeler, load_model, image_path, self.current_image_id, config, overwrite_labels
+        )
+        worker.inference_finished.connect(self.on_single_inference_finished)
+        self.single_inference_worker = worker
+        worker.start()
+    
+    def on_single_inference_finished(self, success: bool, annotations: list, message: str):
+        """单张推理完成回调"""
+        worker = self.sender()
+        if worker is not self.single_inference_worker:
+            return
+        self.single_inference_worker = None
+        image_id = worker.image_id
+        overwrite_labels = worker.overwrite_labels
+        worker.wait()
+        worker.deleteLater()
+        
+        # 隐藏加载动画
+        self.hide_loading_animation()
+        
+        if not success:
+            QMessageBox.critical(self, "错误", f"自动标注失败: {message}")
+            return
+        
+        try:
+            # 更新推理图像的标注
+            if annotations and image_id:
+                # 在后台线程中批量写入（需要覆盖原标签时同一事务内先删除原标注），
+                # 完成后再刷新标注并提示
+                self.save_inference_annotations(image_id, annotations, replace=overwrite_labels)
             else:
-                # 如果没有检测到目标，但需要覆盖原标签，也删除原标注
-                if overwrite_labels and self.current_image_id:
-                    db.delete_image_annotations(self.current_image_id)
-                    self.load_current_image_annotations()
+                # 如果没有检测到目标，但需要覆盖原标签，也在后台删除原标注
+                if overwrite_labels and image_id:
+                    self.save_inference_annotations(image_id, [], replace=True)
                 QMessageBox.information(self, "提示", "未检测到目标")
         except Exception as e:
             QMessageBox.critical(self, "错误", f"自动标注失败: {str(e)}")
     
+    def save_inference_annotations(self, image_id: int, annotations: List[Dict], replace: bool = False):
+        """解析推理结果的类别，并在后台线程中一次性批量写入数据库
+        
+        replace为True时在同一事务中先删除该图片的原有标注。
+        """
+        class_names = {class_id: cls['name'] for class_id, cls in self._class_by_id.items()}
+        
+        # 先收集所有未知类别，统一追加后只更新一次项目类别
+        new_classes = []
+        for annotation in annotations:
+            class_id = annotation['class_id']
+            if class_id not in class_names:
+                # 创建新类别，生成随机颜色
+                class_names[class_id] = f"class_{class_id}"
+                new_classes.append({
+                    'id': class_id,
+                    'name': class_names[class_id],
+                    'color': f"#{random.randint(0, 0xFFFFFF):06x}"
+                })
+        if new_classes:
+            self.classes.extend(new_classes)
+            db.update_project(self.current_project_id, classes=self.classes)
+            # 新类别增量加入类别列表、下拉框和画布颜色表
+            self.append_class_items(new_classes)
+        
+        rows = [
+            {
+                'class_id': annotation['class_id'],
+                'class_name': class_names[annotation['class_id']],
+                'type': annotation['type'],
+                'data': annotation['data']
+            }
+            for annotation in annotations
+        ]
+        
+        worker = AnnotationSaveWorker(image_id, self.current_project_id, rows, replace)
+        worker.save_finished.connect(self.on_inference_annotations_saved)
+        self.annotation_save_workers.append(worker)
+        worker.start()
+    
+    def on_inference_annotations_saved(self, success: bool, image_id: int, message: str):
+        """推理结果写入完成回调"""
+        worker = self.sender()
+        if worker in self.annotation_save_workers:
+            self.annotation_save_workers.remove(worker)
+            worker.wait()
+            worker.deleteLater()
+        
+        if not success:
+            QMessageBox.critical(self, "错误", f"自动标注失败: {message}")
+            return
+        
+        # 重新加载当前图像的标注（写入期间可能已切换到其他图片）
+        if image_id == self.current_image_id:
+            self.load_current_image_annotations()
+        
+        # 未检测到目标时只是清除原标注，提示已在推理完成时给出
+        if worker is not None and worker.annotations:
+            QMessageBox.information(self, "成功", "自动标注完成！")
+    
     def on_batch_inference_requested(self, model_path, conf_threshold, iou_threshold, class_mapping, images, only_unlabeled, model_task='detect'):
         """批量推理请求回调"""
         # 过滤图像（如果只处理未标注的）
@@ -4477,7 +5402,6 @@ class AnnotatePage(QWidget):
         # 更新状态栏
         self.status_annotation.setText(f"自动标注: {current}/{total}")
         self.status_position.setText(f"当前: {image_name}")
-        self.repaint()
     
     def on_batch_inference_completed(self, success, message, processed_count):
         """批量推理完成回调"""
@@ -4486,8 +5410,10 @@ class AnnotatePage(QWidget):
         else:
             QMessageBox.critical(self, "错误", f"批量自动标注失败: {message}")
         
-        # 重新加载图片列表以更新状态
-        self.load_image_list()
+        # 图片集合没有变化，只增量刷新状态改变的列表项，不重建列表和缩略图
+        self.update_image_list_display()
+        self._invalidate_sample_stats_cache()
+        self.update_sample_control_panel()
         
         # 重置状态栏
         self.update_status_bar()
@@ -4495,7 +5421,7 @@ class AnnotatePage(QWidget):
     def load_current_image_annotations(self):
         """加载当前图像的标注"""
         if self.current_image_id:
-            self.annotations = db.get_image_annotations(self.current_image_id)
+            self._set_annotations(db.get_image_annotations(self.current_image_id))
             self.canvas.set_annotations(self.annotations)
             self.update_status_bar()
             self._invalidate_sample_stats_cache()
@@ -4505,7 +5431,7 @@ class AnnotatePage(QWidget):
         """更新状态栏"""
         if self.images and self.current_image_id:
             # 找到当前图像的索引
-            current_index = next((i for i, img in enumerate(self.images) if img['id'] == self.current_image_id), -1)
+            current_index = self._image_index_by_id.get(self.current_image_id, -1)
             if current_index >= 0:
                 self.status_image.setText(f"当前: {current_index + 1}/{len(self.images)}")
         else:
@@ -4530,24 +5456,11 @@ class AnnotatePage(QWidget):
         self._refresh_annotation_class_controls()
     
     def filter_images(self, filter_text: str):
-        """筛选图片"""
-        for i in range(self.image_list.count()):
-            item = self.image_list.item(i)
-            image_id = item.data(Qt.ItemDataRole.UserRole)
-            
-            # 找到对应的图片数据
-            image_data = next((img for img in self.images if img['id'] == image_id), None)
-            if not image_data:
-                continue
-            
-            status = image_data.get('status', 'pending')
-            
-            if filter_text == "全部":
-                item.setHidden(False)
-            elif filter_text == "未标注":
-                item.setHidden(status != 'pending')
-            elif filter_text == "已标注":
-                item.setHidden(status == 'pending')
+        """筛选图片（按状态分组整组切换列表项可见性，不重建列表）"""
+        for status, items in self._items_by_status.items():
+            hidden = not self._image_matches_filter(status, filter_text)
+            for item in items.values():
+                item.setHidden(hidden)
     
     def on_image_selected(self, item: QListWidgetItem):
         """图片选中事件"""
@@ -4594,11 +5507,12 @@ class AnnotatePage(QWidget):
     
     def load_image(self, image_id: int):
         """加载图片"""
+        self._pending_nav_image_id = None  # 直接加载会取代尚未执行的快捷键翻页
         self.current_image_id = image_id
         self.update_delete_menu_state()
         
         # 找到图片数据
-        image_data = next((img for img in self.images if img['id'] == image_id), None)
+        image_data = self._images_by_id.get(image_id)
         if not image_data:
             return
         
@@ -4622,21 +5536,28 @@ class AnnotatePage(QWidget):
         self.update_status_bar()
         
         # 高亮当前项并滚动到该项
-        for i in range(self.image_list.count()):
-            item = self.image_list.item(i)
-            if item.data(Qt.ItemDataRole.UserRole) == image_id:
-                item.setSelected(True)
-                # 滚动到当前项
-                self.image_list.scrollToItem(item)
-            else:
-                item.setSelected(False)
+        item = self.image_items.get(image_id)
+        if item is not None:
+            self.image_list.setCurrentItem(item)
+            self.image_list.scrollToItem(item)
     
+    def _set_images(self, images: List[Dict]):
+        """设置图片列表并重建按ID查找的索引"""
+        self.images = images
+        self._images_by_id = {img['id']: img for img in images}
+        self._image_index_by_id = {img['id']: i for i, img in enumerate(images)}
+
+    def _set_annotations(self, annotations: List[Dict]):
+        """设置当前图片的标注并重建按ID查找的索引"""
+        self.annotations = annotations
+        self._annotations_by_id = {ann['id']: ann for ann in annotations}
+
     def load_annotations(self):
         """加载标注"""
         if not self.current_image_id:
             return
         
-        self.annotations = db.get_image_annotations(self.current_image_id)
+        self._set_annotations(db.get_image_annotations(self.current_image_id))
         self.canvas.set_annotations(self.annotations)
         self.update_status_bar()
         self._refresh_annotation_class_controls()
@@ -4670,11 +5591,11 @@ class AnnotatePage(QWidget):
         """清空当前图片显示与相关状态。"""
         self.current_image_id = None
         self.current_image_data = None
-        self.annotations = []
-        self.history = []
+        self._set_annotations([])
+        self.history = deque(maxlen=MAX_HISTORY_SIZE)
         self.history_index = -1
         self.canvas.selected_annotation_id = None
-        self.canvas.set_annotations([])
+        self.canvas.set_annotations(self.annotations)
         self.canvas.load_image("")
         self.clear_attribute_panel(refresh_sample_panel=False)
         self.update_status_bar()
@@ -4686,14 +5607,8 @@ class AnnotatePage(QWidget):
             QMessageBox.warning(self, "提示", "当前没有可删除的图片")
             return
 
-        current_index = next(
-            (i for i, image in enumerate(self.images) if image['id'] == self.current_image_id),
-            -1
-        )
-        current_image = next(
-            (image for image in self.images if image['id'] == self.current_image_id),
-            None
-        )
+        current_index = self._image_index_by_id.get(self.current_image_id, -1)
+        current_image = self._images_by_id.get(self.current_image_id)
         if current_index < 0 or current_image is None:
             QMessageBox.warning(self, "提示", "当前图片不存在或已失效，请先重新加载")
             return
@@ -4753,8 +5668,21 @@ class AnnotatePage(QWidget):
         # 更新图片状态为已标注
         db.update_image_status(self.current_image_id, 'annotated')
         
-        # 重新加载标注
-        self.load_annotations()
+        # 直接在内存中追加新标注，无需重新查询数据库
+        row = {
+            'id': ann_id,
+            'image_id': self.current_image_id,
+            'project_id': self.current_project_id,
+            'class_id': class_id,
+            'class_name': class_name,
+            'type': annotation['type'],
+            'data': annotation['data'],
+            'attributes': {}
+        }
+        self.canvas.add_annotation(row)
+        self._annotations_by_id[ann_id] = row
+        self.update_status_bar()
+        self._refresh_annotation_class_controls()
         
         # 更新图片列表显示
         self.update_image_list_display()
@@ -4764,13 +5692,13 @@ class AnnotatePage(QWidget):
     def on_annotation_selected(self, annotation_id: int):
         """标注选中事件"""
         # 更新属性面板
-        annotation = next((ann for ann in self.annotations if ann['id'] == annotation_id), None)
+        annotation = self._annotations_by_id.get(annotation_id)
         if annotation:
             self.update_attribute_panel(annotation)
     
     def on_annotation_modified(self, annotation_id: int, data: dict):
         """标注修改事件（拖动或调整大小后）"""
-        annotation = next((ann for ann in self.annotations if ann['id'] == annotation_id), None)
+        annotation = self._annotations_by_id.get(annotation_id)
         if annotation:
             # 更新数据库中的标注
             db.update_annotation(annotation_id, data=data)
@@ -4784,15 +5712,17 @@ class AnnotatePage(QWidget):
     def on_annotation_deleted(self, annotation_id: int):
         """标注删除事件"""
         # 保存到历史记录
-        annotation = next((ann for ann in self.annotations if ann['id'] == annotation_id), None)
+        annotation = self._annotations_by_id.get(annotation_id)
         if annotation:
             self.add_history('delete', annotation)
         
         # 从数据库删除
         db.delete_annotation(annotation_id)
         
-        # 重新加载
-        self.load_annotations()
+        # 直接从内存中移除，无需重新查询数据库
+        self.canvas.remove_annotation(annotation_id)
+        self._annotations_by_id.pop(annotation_id, None)
+        self.update_status_bar()
         self.canvas.selected_annotation_id = None
         self.clear_attribute_panel(refresh_sample_panel=False)
         
@@ -4835,7 +5765,7 @@ class AnnotatePage(QWidget):
         if self.canvas.selected_annotation_id is None:
             return
         
-        annotation = next((ann for ann in self.annotations if ann['id'] == self.canvas.selected_annotation_id), None)
+        annotation = self._annotations_by_id.get(self.canvas.selected_annotation_id)
         if not annotation:
             return
         
@@ -4851,7 +5781,7 @@ class AnnotatePage(QWidget):
             QMessageBox.warning(self, "提示", "请先选中一个标注再修改类别")
             return
         
-        annotation = next((ann for ann in self.annotations if ann['id'] == self.canvas.selected_annotation_id), None)
+        annotation = self._annotations_by_id.get(self.canvas.selected_annotation_id)
         if not annotation:
             return
         
@@ -4861,7 +5791,7 @@ class AnnotatePage(QWidget):
             QMessageBox.warning(self, "提示", "当前没有可用类别")
             return
 
-        class_info = next((cls for cls in self.classes if cls['id'] == class_id), None)
+        class_info = self._class_by_id.get(class_id)
         class_name = class_info['name'] if class_info else 'unknown'
 
         if class_id == annotation.get('class_id'):
@@ -4878,12 +5808,10 @@ class AnnotatePage(QWidget):
             QMessageBox.warning(self, "提示", "标注类别修改失败")
             return
         
-        # 刷新显示
-        self.load_annotations()
+        # 刷新显示（标注已在内存中原地更新，无需重新查询数据库）
         self.canvas.selected_annotation_id = annotation['id']
-        updated_annotation = next((ann for ann in self.annotations if ann['id'] == annotation['id']), None)
-        if updated_annotation:
-            self.update_attribute_panel(updated_annotation)
+        self.update_attribute_panel(annotation)
+        self._refresh_annotation_class_controls()
         self.canvas.update()
         self._invalidate_sample_stats_cache()
         self.update_sample_control_panel()
@@ -5038,10 +5966,7 @@ class AnnotatePage(QWidget):
 
     def _get_next_image_shortcut_key(self) -> str:
         """获取当前“下一张”快捷键。"""
-        from PyQt6.QtCore import QSettings
-
-        settings = QSettings("EzYOLO", "Settings")
-        return str(settings.value("next_image_shortcut", "D")).upper()
+        return self._shortcuts['next_image']
 
     def _exec_message_box_with_shortcut(
         self,
@@ -5151,7 +6076,7 @@ class AnnotatePage(QWidget):
     def edit_class(self, item: QListWidgetItem):
         """编辑类别"""
         class_id = item.data(Qt.ItemDataRole.UserRole)
-        class_info = next((c for c in self.classes if c['id'] == class_id), None)
+        class_info = self._class_by_id.get(class_id)
         if not class_info:
             return
         
@@ -5179,13 +6104,13 @@ class AnnotatePage(QWidget):
         # 保存到数据库
         db.update_project(self.current_project_id, classes=self.classes)
         
-        # 更新显示
-        self.update_class_list()
+        # 只刷新被修改的类别
+        self.update_class_item(class_id)
     
     def delete_class(self, item: QListWidgetItem):
         """删除类别"""
         class_id = item.data(Qt.ItemDataRole.UserRole)
-        class_info = next((c for c in self.classes if c['id'] == class_id), None)
+        class_info = self._class_by_id.get(class_id)
         if not class_info:
             return
         
@@ -5199,20 +6124,21 @@ class AnnotatePage(QWidget):
         if reply != QMessageBox.StandardButton.Yes:
             return
         
-        # 删除该类别下的所有标注
-        for annotation in self.annotations:
-            if annotation.get('class_id') == class_id:
-                db.delete_annotation(annotation['id'])
-        
         # 从列表中删除类别
         self.classes = [c for c in self.classes if c['id'] != class_id]
         
-        # 重新编号
+        # 重新编号，并记录 旧ID -> 新ID 映射以同步剩余标注
+        class_remap = {}
         for i, cls in enumerate(self.classes):
+            if cls['id'] != i:
+                class_remap[cls['id']] = i
             cls['id'] = i
         
-        # 保存到数据库
-        db.update_project(self.current_project_id, classes=self.classes)
+        # 删除该类别下的所有标注、改写剩余标注的类别ID并保存类别列表（同一事务）
+        db.delete_annotations_by_class(
+            self.current_project_id, class_id,
+            classes=self.classes, class_remap=class_remap
+        )
         
         # 更新显示
         self._invalidate_sample_stats_cache()
@@ -5229,26 +6155,84 @@ class AnnotatePage(QWidget):
                 color = QColor(255, 0, 0)
             
             class_id = len(self.classes)
-            self.classes.append({
+            new_class = {
                 'id': class_id,
                 'name': name,
                 'color': color.name()
-            })
+            }
+            self.classes.append(new_class)
             
             # 更新项目类别
             db.update_project(self.current_project_id, classes=self.classes)
             
-            self.update_class_list()
+            self.append_class_items([new_class])
             # 选中新添加的类别
             self.class_list.setCurrentRow(self.class_list.count() - 1)
             self.on_class_selected()
     
+    def bulk_add_classes(self):
+        """批量添加类别：一个对话框输入多个名称，颜色按色相均匀分配，只写一次数据库"""
+        dialog = QDialog(self)
+        dialog.setWindowTitle("批量添加类别")
+        dialog.setMinimumWidth(320)
+        
+        layout = QVBoxLayout(dialog)
+        layout.addWidget(QLabel("每行输入一个类别名称（已存在的名称会被跳过）:"))
+        names_edit = QTextEdit()
+        names_edit.setAcceptRichText(False)
+        layout.addWidget(names_edit)
+        
+        # 按钮
+        btn_layout = QHBoxLayout()
+        btn_ok = QPushButton("添加")
+        btn_ok.clicked.connect(dialog.accept)
+        btn_cancel = QPushButton("取消")
+        btn_cancel.clicked.connect(dialog.reject)
+        btn_layout.addWidget(btn_ok)
+        btn_layout.addWidget(btn_cancel)
+        layout.addLayout(btn_layout)
+        
+        if dialog.exec() != QDialog.DialogCode.Accepted:
+            return
+        
+        # 去掉空行、重复名称和已存在的类别
+        existing_names = {cls['name'] for cls in self.classes}
+        names = []
+        for line in names_edit.toPlainText().splitlines():
+            name = line.strip()
+            if name and name not in existing_names:
+                existing_names.add(name)
+                names.append(name)
+        if not names:
+            return
+        
+        # 类别ID可能不连续（如推理时保留模型ID创建的类别），从现有最大ID之后分配
+        first_id = max((cls['id'] for cls in self.classes), default=-1) + 1
+        count = len(names)
+        new_classes = [
+            {
+                'id': first_id + i,
+                'name': name,
+                'color': QColor.fromHsvF(i / count, 0.8, 0.9).name()
+            }
+            for i, name in enumerate(names)
+        ]
+        self.classes.extend(new_classes)
+        
+        # 更新项目类别（一次写入）
+        db.update_project(self.current_project_id, classes=self.classes)
+        
+        self.append_class_items(new_classes)
+        # 选中第一个新添加的类别
+        self.class_list.setCurrentItem(self._class_list_items_by_id[first_id])
+        self.on_class_selected()
+    
     def prev_image(self):
         """上一张图片"""
         if not self.images or not self.current_image_id:
             return
         
-        current_index = next((i for i, img in enumerate(self.images) if img['id'] == self.current_image_id), 0)
+        current_index = self._image_index_by_id.get(self.current_image_id, 0)
         if current_index > 0:
             new_image_id = self.images[current_index - 1]['id']
             self.load_image(new_image_id)
@@ -5258,7 +6242,7 @@ class AnnotatePage(QWidget):
         if not self.images or not self.current_image_id:
             return
         
-        current_index = next((i for i, img in enumerate(self.images) if img['id'] == self.current_image_id), -1)
+        current_index = self._image_index_by_id.get(self.current_image_id, -1)
         if current_index < len(self.images) - 1:
             new_image_id = self.images[current_index + 1]['id']
             self.load_image(new_image_id)
@@ -5266,19 +6250,15 @@ class AnnotatePage(QWidget):
     def add_history(self, action: str, data: dict):
         """添加历史记录"""
         # 删除当前位置之后的历史
-        self.history = self.history[:self.history_index + 1]
+        while len(self.history) > self.history_index + 1:
+            self.history.pop()
         
-        # 添加新记录
+        # 添加新记录（deque 达到 maxlen 时自动丢弃最早的记录）
         self.history.append({
             'action': action,
             'data': data
         })
         self.history_index = len(self.history) - 1
-        
-        # 限制历史记录数量
-        if len(self.history) > 50:
-            self.history.pop(0)
-            self.history_index -= 1
     
     def undo(self):
         """撤销"""
@@ -5315,7 +6295,7 @@ class AnnotatePage(QWidget):
         total = len(self.images)
         current = 0
         if self.current_image_id:
-            current = next((i for i, img in enumerate(self.images) if img['id'] == self.current_image_id), 0) + 1
+            current = self._image_index_by_id.get(self.current_image_id, 0) + 1
         
         self.status_image.setText(f"当前: {current}/{total}")
         self.status_annotation.setText(f"标注: {len(self.annotations)}")
@@ -5328,31 +6308,30 @@ class AnnotatePage(QWidget):
         }
         self.status_tool.setText(f"工具: {tool_names.get(self.canvas.current_tool, self.canvas.current_tool)}")
     
+    def _on_shortcut_rect(self):
+        """矩形工具快捷键"""
+        self.select_draw_tool('rectangle')
+    
+    def _on_shortcut_poly(self):
+        """多边形工具快捷键"""
+        self.select_draw_tool('polygon')
+    
+    def _on_shortcut_move(self):
+        """移动工具快捷键"""
+        self.btn_move.setChecked(True)
+        self.set_tool('move')
+    
+    def _on_shortcut_delete(self):
+        """删除快捷键"""
+        self.delete_selected_annotation()
+    
     def keyPressEvent(self, event: QKeyEvent):
         """键盘事件"""
-        from PyQt6.QtCore import QSettings
-        
-        # 获取快捷键设置
-        settings = QSettings("EzYOLO", "Settings")
-        rect_tool_key = settings.value("rect_tool_shortcut", "W").upper()
-        poly_tool_key = settings.value("poly_tool_shortcut", "P").upper()
-        move_tool_key = settings.value("move_tool_shortcut", "V").upper()
-        delete_key = settings.value("delete_shortcut", "DELETE").upper()
-        
-        # 处理工具快捷键
+        # 处理工具快捷键（按键分派表由 _refresh_navigation_shortcuts 预先构建）
         key_text = event.text().upper()
-        if key_text == rect_tool_key:
-            self.select_draw_tool('rectangle')
-            return
-        elif key_text == poly_tool_key:
-            self.select_draw_tool('polygon')
-            return
-        elif key_text == move_tool_key:
-            self.btn_move.setChecked(True)
-            self.set_tool('move')
-            return
-        elif key_text == delete_key:
-            self.delete_selected_annotation()
+        handler = self._key_dispatch.get(key_text)
+        if handler is not None:
+            handler()
         elif event.modifiers() == Qt.KeyboardModifier.ControlModifier and event.key() == Qt.Key.Key_Z:
             self.undo()
         else:
@@ -5367,202 +6346,7 @@ class AnnotatePage(QWidget):
     
     def export_annotations(self):
         """导出标注文件"""
-        import shutil
-        from PyQt6.QtWidgets import QMessageBox, QFileDialog
-        
-        if not self.current_project_id:
-            QMessageBox.warning(self, "导出失败", "请先选择一个项目")
-            return
-        
-        # 选择导出目录
-        export_dir = QFileDialog.getExistingDirectory(
-            self, "选择导出目录", 
-            os.path.expanduser("~")
-        )
-        
-        if not export_dir:
-            return
-        
-        try:
-            # 获取导出格式
-            export_format = self.export_format.currentText()
-            
-            # 获取项目信息
-            project = db.get_project(self.current_project_id)
-            if not project:
-                QMessageBox.warning(self, "导出失败", "无法获取项目信息")
-                return
-            
-            project_name = project.get('name', 'untitled')
-            
-            # 创建导出目录结构
-            export_path = os.path.join(export_dir, f"{project_name}_annotations")
-            os.makedirs(export_path, exist_ok=True)
-            
-            # 获取项目图片
-            images = db.get_project_images(self.current_project_id)
-            if not images:
-                QMessageBox.warning(self, "导出失败", "项目中没有图片")
-                return
-            
-            # 获取类别映射
-            class_mapping = {cls['id']: cls['name'] for cls in self.classes}
-            
-            if export_format == "YOLO格式":
-                # 创建labels目录
-                labels_dir = os.path.join(export_path, 'labels')
-                os.makedirs(labels_dir, exist_ok=True)
-                
-                # 导出每个图片的标注
-                exported_count = 0
-                negative_count = 0
-                for image in images:
-                    image_id = image['id']
-                    annotations = db.get_image_annotations(image_id)
-                    image_status = image.get('status', 'pending')
-                    
-                    if annotations or image_status == 'annotated':
-                        # 已标注图片都应生成标签文件；负样本生成空txt
-                        filename = os.path.splitext(image['filename'])[0] + '.txt'
-                        label_file = os.path.join(labels_dir, filename)
-                        
-                        with open(label_file, 'w', encoding='utf-8') as f:
-                            for ann in annotations:
-                                class_id = ann.get('class_id', 0)
-                                ann_type = ann.get('type', 'bbox')
-                                data = ann.get('data', {})
-                                
-                                if ann_type == 'bbox':
-                                    # YOLO格式：class_id x_center y_center width height
-                                    x = data.get('x', 0)
-                                    y = data.get('y', 0)
-                                    width = data.get('width', 0)
-                                    height = data.get('height', 0)
-
-                                    # 计算中心点和归一化
-                                    img_width = image.get('width', 1920)  # 默认宽度
-                                    img_height = image.get('height', 1080)  # 默认高度
-
-                                    x_center = (x + width/2) / img_width
-                                    y_center = (y + height/2) / img_height
-                                    norm_width = width / img_width
-                                    norm_height = height / img_height
-
-                                    # 写入文件
-                                    f.write(f"{class_id} {x_center:.6f} {y_center:.6f} {norm_width:.6f} {norm_height:.6f}\n")
-                                elif ann_type == 'mask':
-                                    # YOLO分割格式：class_id x1 y1 x2 y2 ... xn yn
-                                    mask = data.get('mask', [])
-                                    if mask:
-                                        # 计算归一化
-                                        img_width = image.get('width', 1920)  # 默认宽度
-                                        img_height = image.get('height', 1080)  # 默认高度
-
-                                        # 构建归一化的多边形坐标
-                                        normalized_points = []
-                                        for point in mask:
-                                            if isinstance(point, (list, tuple)) and len(point) >= 2:
-                                                x, y = point[0], point[1]
-                                                norm_x = x / img_width
-                                                norm_y = y / img_height
-                                                normalized_points.extend([f"{norm_x:.6f}", f"{norm_y:.6f}"])
-
-                                        if normalized_points:
-                                            # 写入文件
-                                            f.write(f"{class_id} {' '.join(normalized_points)}\n")
-                        
-                        exported_count += 1
-                        if not annotations:
-                            negative_count += 1
-                
-                # 创建classes.txt文件
-                classes_file = os.path.join(export_path, 'classes.txt')
-                with open(classes_file, 'w', encoding='utf-8') as f:
-                    for cls in sorted(self.classes, key=lambda x: x['id']):
-                        f.write(f"{cls['name']}\n")
-                
-                QMessageBox.information(
-                    self,
-                    "导出成功",
-                    f"已导出 {exported_count} 个标注文件到\n{export_path}\n\n"
-                    f"- 负样本空标签: {negative_count} 个"
-                )
-                
-            elif export_format == "COCO格式":
-                # 导出COCO格式
-                import json
-                
-                # 创建COCO格式的标注数据
-                coco_data = {
-                    "info": {
-                        "description": f"Annotations for {project_name}",
-                        "version": "1.0",
-                        "year": 2024
-                    },
-                    "licenses": [],
-                    "images": [],
-                    "annotations": [],
-                    "categories": []
-                }
-                
-                # 添加类别
-                for cls in self.classes:
-                    coco_data["categories"].append({
-                        "id": cls['id'],
-                        "name": cls['name'],
-                        "supercategory": "object"
-                    })
-                
-                # 添加图片和标注
-                annotation_id = 1
-                for image in images:
-                    # 添加图片信息
-                    image_info = {
-                        "id": image['id'],
-                        "file_name": image['filename'],
-                        "width": image.get('width', 1920),
-                        "height": image.get('height', 1080),
-                        "date_captured": "",
-                        "license": 0,
-                        "coco_url": "",
-                        "flickr_url": ""
-                    }
-                    coco_data["images"].append(image_info)
-                    
-                    # 添加标注
-                    annotations = db.get_image_annotations(image['id'])
-                    for ann in annotations:
-                        ann_type = ann.get('type', 'bbox')
-                        data = ann.get('data', {})
-                        
-                        if ann_type == 'bbox':
-                            # COCO格式：x y width height
-                            x = int(data.get('x', 0))
-                            y = int(data.get('y', 0))
-                            width = int(data.get('width', 0))
-                            height = int(data.get('height', 0))
-                            
-                            coco_annotation = {
-                                "id": annotation_id,
-                                "image_id": image['id'],
-                                "category_id": ann.get('class_id', 0),
-                                "segmentation": [],
-                                "area": width * height,
-                                "bbox": [x, y, width, height],
-                                "iscrowd": 0
-                            }
-                            coco_data["annotations"].append(coco_annotation)
-                            annotation_id += 1
-                
-                # 保存COCO格式文件
-                coco_file = os.path.join(export_path, 'annotations.json')
-                with open(coco_file, 'w', encoding='utf-8') as f:
-                    json.dump(coco_data, f, indent=2, ensure_ascii=False)
-                
-                QMessageBox.information(self, "导出成功", f"已导出 COCO 格式标注到\n{coco_file}")
-                
-        except Exception as e:
-            QMessageBox.critical(self, "导出失败", f"导出过程中出错:\n{str(e)}")
+        self._start_export('annotations')
     
     def run_llm_single_inference(self):
         """运行LLM单张推理"""
@@ -5586,11 +6370,7 @@ class AnnotatePage(QWidget):
             return
         
         # 获取当前图片路径
-        current_image = None
-        for img in self.images:
-            if img['id'] == self.current_image_id:
-                current_image = img
-                break
+        current_image = self._images_by_id.get(self.current_image_id)
         
         if not current_image:
             QMessageBox.warning(self, "提示", "无法获取当前图片信息")
@@ -5635,77 +6415,6 @@ class AnnotatePage(QWidget):
         progress.show()
         
         # 在后台线程中运行LLM推理
-        from PyQt6.QtCore import QThread, pyqtSignal
-        
-        class LLMInferenceWorker(QThread):
-            """LLM推理工作线程"""
-            inference_finished = pyqtSignal(bool, str, list)  # 成功, 消息, 检测结果
-            
-            def __init__(self, config, image_path, target):
-                super().__init__()
-                self.config = config
-                self.image_path = image_path
-                self.target = target
-            
-            def run(self):
-                try:
-                    import base64
-                    import re
-                    from openai import OpenAI
-                    
-                    # 读取图片
-                    with open(self.image_path, "rb") as f:
-                        img_base64 = base64.b64encode(f.read()).decode("utf-8")
-                    
-                    # 创建客户端
-                    client = OpenAI(
-                        api_key=self.config['api_key'],
-                        base_url=self.config['base_url']
-                    )
-                    
-                    # 格式化提示词
-                    system_prompt = self.config['system_prompt']
-                    user_prompt = self.config['user_prompt'].format(target=self.target)
-                    
-                    # 调用API
-                    completion = client.chat.completions.create(
-                        model=self.config['model_name'],
-                        messages=[
-                            {"role": "system", "content": system_prompt},
-                            {
-                                "role": "user",
-                                "content": [
-                                    {"type": "text", "text": user_prompt},
-                                    {
-                                        "type": "image_url",
-                                        "image_url": {"url": f"data:image/jpeg;base64,{img_base64}"}
-                                    }
-                                ]
-                            }
-                        ]
-                    )
-                    
-                    response_text = completion.choices[0].message.content
-                    print(f"LLM返回:\n{response_text}")
-                    
-                    # 解析返回的文本格式: target,[xmin,ymin,xmax,ymax]
-                    detections = []
-                    pattern = r'([^,\n]+),\[(\d+),(\d+),(\d+),(\d+)\]'
-                    matches = re.findall(pattern, response_text)
-                    
-                    for match in matches:
-                        label, xmin, ymin, xmax, ymax = match
-                        detections.append({
-                            "label": label.strip(),
-                            "bbox": [int(xmin), int(ymin), int(xmax), int(ymax)]
-                        })
-                    
-                    self.inference_finished.emit(True, f"检测到 {len(detections)} 个目标", detections)
-                    
-                except Exception as e:
-                    self.inference_finished.emit(False, f"推理出错: {str(e)}", [])
-        
-        # 创建并启动工作线程
         self.llm_worker = LLMInferenceWorker(llm_config, image_path, target_class)
         self.llm_worker.inference_finished.connect(
             lambda success, msg, detections: self.on_llm_inference_finished(success, msg, detections, progress)
@@ -5997,8 +6706,15 @@ class AnnotatePage(QWidget):
     
     def export_dataset(self):
         """导出完整数据集"""
-        import shutil
-        from PyQt6.QtWidgets import QMessageBox, QFileDialog
+        self._start_export('dataset')
+    
+    def _start_export(self, mode: str):
+        """选择导出目录后在后台线程中导出，进度通过信号回到界面线程"""
+        from PyQt6.QtWidgets import QProgressDialog
+        
+        if self.export_worker is not None:
+            QMessageBox.information(self, "提示", "正在导出中，请稍候")
+            return
         
         if not self.current_project_id:
             QMessageBox.warning(self, "导出失败", "请先选择一个项目")
@@ -6013,140 +6729,54 @@ class AnnotatePage(QWidget):
         if not export_dir:
             return
         
-        try:
-            # 获取导出格式
-            export_format = self.export_format.currentText()
-            
-            # 获取项目信息
-            project = db.get_project(self.current_project_id)
-            if not project:
-                QMessageBox.warning(self, "导出失败", "无法获取项目信息")
-                return
-            
-            project_name = project.get('name', 'untitled')
-            
-            # 创建导出目录结构
-            dataset_dir = os.path.join(export_dir, project_name)
-            os.makedirs(dataset_dir, exist_ok=True)
-            
-            # 创建images和labels目录
-            images_dir = os.path.join(dataset_dir, 'images')
-            labels_dir = os.path.join(dataset_dir, 'labels')
-            os.makedirs(images_dir, exist_ok=True)
-            os.makedirs(labels_dir, exist_ok=True)
-            
-            # 获取项目图片
-            images = db.get_project_images(self.current_project_id)
-            if not images:
-                QMessageBox.warning(self, "导出失败", "项目中没有图片")
-                return
-            
-            # 获取类别映射
-            class_mapping = {cls['id']: cls['name'] for cls in self.classes}
-            
-            # 复制图片并导出标注
-            copied_count = 0
-            exported_count = 0
-            negative_count = 0
-            
-            for image in images:
-                # 复制图片
-                src_image = image.get('storage_path', '')
-                if src_image and os.path.exists(src_image):
-                    dst_image = os.path.join(images_dir, image['filename'])
-                    shutil.copy2(src_image, dst_image)
-                    copied_count += 1
-                
-                # 导出标注
-                image_id = image['id']
-                annotations = db.get_image_annotations(image_id)
-                image_status = image.get('status', 'pending')
-                
-                if annotations or image_status == 'annotated':
-                    # 已标注图片都应生成标签文件；负样本生成空txt
-                    filename = os.path.splitext(image['filename'])[0] + '.txt'
-                    label_file = os.path.join(labels_dir, filename)
-                    
-                    with open(label_file, 'w', encoding='utf-8') as f:
-                        for ann in annotations:
-                            class_id = ann.get('class_id', 0)
-                            ann_type = ann.get('type', 'bbox')
-                            data = ann.get('data', {})
-                            
-                            # 获取图片尺寸
-                            img_width = image.get('width', 1920)  # 默认宽度
-                            img_height = image.get('height', 1080)  # 默认高度
-                            
-                            if ann_type == 'bbox':
-                                # YOLO格式：class_id x_center y_center width height
-                                x = data.get('x', 0)
-                                y = data.get('y', 0)
-                                width = data.get('width', 0)
-                                height = data.get('height', 0)
-                                
-                                # 计算中心点和归一化
-                                x_center = (x + width/2) / img_width
-                                y_center = (y + height/2) / img_height
-                                norm_width = width / img_width
-                                norm_height = height / img_height
-                                
-                                # 写入文件
-                                f.write(f"{class_id} {x_center:.6f} {y_center:.6f} {norm_width:.6f} {norm_height:.6f}\n")
-                            
-                            elif ann_type == 'polygon':
-                                # YOLO分割格式：class_id x1 y1 x2 y2 ... xn yn
-                                points = data.get('points', [])
-                                if points:
-                                    # 构建归一化的多边形坐标
-                                    normalized_points = []
-                                    for point in points:
-                                        if isinstance(point, dict):
-                                            x = point.get('x', 0)
-                                            y = point.get('y', 0)
-                                        elif isinstance(point, (list, tuple)) and len(point) >= 2:
-                                            x, y = point[0], point[1]
-                                        else:
-                                            continue
-                                        norm_x = x / img_width
-                                        norm_y = y / img_height
-                                        normalized_points.extend([f"{norm_x:.6f}", f"{norm_y:.6f}"])
-                                    
-                                    if normalized_points:
-                                        # 写入文件
-                                        f.write(f"{class_id} {' '.join(normalized_points)}\n")
-                    
-                    exported_count += 1
-                    if not annotations:
-                        negative_count += 1
-            
-            # 创建classes.txt文件
-            classes_file = os.path.join(dataset_dir, 'classes.txt')
-            with open(classes_file, 'w', encoding='utf-8') as f:
-                for cls in sorted(self.classes, key=lambda x: x['id']):
-                    f.write(f"{cls['name']}\n")
-            
-            # 创建data.yaml文件（YOLO格式）
-            yaml_file = os.path.join(dataset_dir, 'data.yaml')
-            yaml_content = f"""
-train: images
-test: images
-val: images
-
-nc: {len(self.classes)}
-names: {[cls['name'] for cls in sorted(self.classes, key=lambda x: x['id'])]}
-"""
-            
-            with open(yaml_file, 'w', encoding='utf-8') as f:
-                f.write(yaml_content)
-            
-            QMessageBox.information(
-                self,
-                "导出成功",
-                f"已导出完整数据集到\n{dataset_dir}\n\n"
-                f"- 复制图片: {copied_count} 张\n"
-                f"- 导出标注: {exported_count} 个\n"
-                f"- 负样本空标签: {negative_count} 个"
-            )
-            
-        except Exception as e:
-            QMessageBox.critical(self, "导出失败", f"导出过程中出错:\n{str(e)}")
+        # 获取项目信息
+        project = db.get_project(self.current_project_id)
+        if not project:
+            QMessageBox.warning(self, "导出失败", "无法获取项目信息")
+            return
+        
+        worker = ExportWorker(
+            mode, self.current_project_id, project.get('name', 'untitled'),
+            self._sorted_classes, export_dir, self.export_format.currentText()
+        )
+        worker.progress_updated.connect(self.on_export_progress)
+        worker.export_finished.connect(self.on_export_finished)
+        worker.finished.connect(self._release_export_worker)
+        
+        self.export_progress = QProgressDialog("正在导出...", None, 0, 0, self)
+        self.export_progress.setWindowModality(Qt.WindowModality.WindowModal)
+        self.export_progress.show()
+        
+        self.export_worker = worker
+        worker.start()
+    
+    def on_export_progress(self, current: int, total: int, text: str):
+        """导出进度回调"""
+        if self.export_progress is not None:
+            self.export_progress.setLabelText(text)
+            self.export_progress.setMaximum(total)
+            self.export_progress.setValue(current)
+    
+    def on_export_finished(self, success: bool, message: str):
+        """导出完成回调"""
+        self._close_export_progress()
+        if success:
+            QMessageBox.information(self, "导出成功", message)
+        else:
+            QMessageBox.critical(self, "导出失败", message)
+    
+    def _close_export_progress(self):
+        """关闭导出进度对话框"""
+        if self.export_progress is not None:
+            self.export_progress.close()
+            self.export_progress.deleteLater()
+            self.export_progress = None
+    
+    def _release_export_worker(self):
+        """导出线程结束后回收"""
+        worker = self.export_worker
+        self.export_worker = None
+        self._close_export_progress()
+        if worker is not None:
+            worker.wait()
+            worker.deleteLater()
@@ -7,14 +7,14 @@
 from PyQt6.QtWidgets import (
     QDialog, QVBoxLayout, QHBoxLayout, QLabel, QPushButton,
     QComboBox, QGroupBox, QFormLayout, QRadioButton, QDoubleSpinBox,
-    QCheckBox, QListWidget, QListWidgetItem, QSplitter, QMessageBox,
-    QFileDialog, QScrollArea, QWidget, QTabWidget, QTextEdit, QLineEdit
+    QCheckBox, QListView, QAbstractItemView, QSplitter, QMessageBox,
+    QFileDialog, QWidget, QTabWidget, QTextEdit, QLineEdit
 )
-from PyQt6.QtCore import Qt, pyqtSignal
+from PyQt6.QtCore import Qt, pyqtSignal, QAbstractListModel, QModelIndex
 from PyQt6.QtGui import QColor
 import os
 import json
-from typing import Dict, List, Optional
+from types import MappingProxyType
 
 from gui.styles import COLORS
 
@@ -154,6 +154,109 @@ SIZE_NAMES = {
     "u": "ultra (超大)",
 }
 
+# 模型配置为只读常量：外层和每个版本的配置冻结为只读映射，型号/任务列表转为元组
+ULTRALYTICS_MODELS = MappingProxyType({
+    version: MappingProxyType({
+        **config,
+        'sizes': tuple(config['sizes']),
+        'tasks': tuple(config['tasks']),
+    })
+    for version, config in ULTRALYTICS_MODELS.items()
+})
+SIZE_NAMES = MappingProxyType(SIZE_NAMES)
+
+# 由上面的静态配置预先生成的下拉框内容，避免每次打开弹窗/切换版本时重复排序和查表
+_SORTED_MODEL_VERSIONS = tuple(sorted(ULTRALYTICS_MODELS))
+_SIZE_ITEMS = {
+    version: tuple((SIZE_NAMES.get(size, size), size) for size in config['sizes'])
+    for version, config in ULTRALYTICS_MODELS.items()
+}
+# (版本, 尺寸) -> 官方模型名称，如 ("YOLOv8", "n") -> "yolov8n"
+_MODEL_NAMES = {
+    (version, size): config['prefix'] + size
+    for version, config in ULTRALYTICS_MODELS.items()
+    for size in config['sizes']
+}
+
+# 分组框样式表（COLORS 在导入时即确定，只需格式化一次）
+_GROUP_BOX_QSS = f"""
+    QGroupBox {{
+        font-weight: bold;
+        border: 1px solid {COLORS['border']};
+        border-radius: 6px;
+        margin-top: 12px;
+        padding-top: 10px;
+    }}
+    QGroupBox::title {{
+        subcontrol-origin: margin;
+        left: 10px;
+        padding: 0 5px;
+    }}
+"""
+_INNER_GROUP_BOX_QSS = f"""
+    QGroupBox {{
+        font-weight: normal;
+        border: 1px solid {COLORS['border']};
+        border-radius: 4px;
+        margin-top: 8px;
+        padding-top: 8px;
+    }}
+    QGroupBox::title {{
+        subcontrol-origin: margin;
+        left: 8px;
+        padding: 0 4px;
+        font-size: 12px;
+    }}
+"""
+
+# classes.txt 最多读取的类别数
+MAX_MODEL_CLASSES = 10000
+
+# classes.txt 解析结果缓存：(路径, 修改时间, 大小, 类别上限) -> (类别列表, 是否截断)，仅在进程内有效
+_model_classes_cache = {}
+
+# 未加载classes.txt时模型类别列表显示的示例类别
+EXAMPLE_MODEL_CLASSES = ("person", "car", "dog", "cat", "bird")
+
+
+class ClassListModel(QAbstractListModel):
+    """类别列表模型：直接包装类别列表，刷新时整体重置一次，不为每行创建列表项
+    
+    列表元素为类别名字符串（显示为 "行号: 名称"）或类别字典（显示为 "id: name"，并带类别颜色）。
+    """
+    
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._items = []
+        self._colors = {}  # 颜色字符串 -> QColor，跨刷新复用，同色只解析一次
+    
+    def set_classes(self, classes: list):
+        """替换整个类别列表"""
+        self.beginResetModel()
+        self._items = classes
+        self.endResetModel()
+    
+    def rowCount(self, parent=QModelIndex()) -> int:
+        return 0 if parent.isValid() else len(self._items)
+    
+    def data(self, index: QModelIndex, role=Qt.ItemDataRole.DisplayRole):
+        if not index.isValid():
+            return None
+        
+        row = index.row()
+        cls = self._items[row]
+        if role == Qt.ItemDataRole.DisplayRole:
+            if isinstance(cls, dict):
+                return f"{cls['id']}: {cls['name']}"
+            return f"{row}: {cls}"
+        if role == Qt.ItemDataRole.ForegroundRole and isinstance(cls, dict):
+            color_name = cls.get('color', '#808080')
+            color = self._colors.get(color_name)
+            if color is None:
+                color = self._colors[color_name] = QColor(color_name)
+            return color
+        return None
+
 
 class AutoLabelDialog(QDialog):
     """自动打标签弹窗"""
@@ -188,10 +291,13 @@ class AutoLabelDialog(QDialog):
         # 初始化UI
         self.init_ui()
 
-        # 加载SAM配置
-        self.load_sam_config()
+        # 加载已保存的SAM/LLM配置
+        self.reset_state()
         
-        # 加载LLM配置
+    def reset_state(self):
+        """重新应用已保存的配置，复用弹窗时丢弃上次取消未保存的修改，无需重建控件"""
+        self.tab_widget.setCurrentIndex(0)
+        self.load_sam_config()
         self.load_llm_config()
         
     def init_ui(self):
@@ -308,7 +414,7 @@ class AutoLabelDialog(QDialog):
         # 模型版本
         version_layout = QFormLayout()
         self.cb_model_version = QComboBox()
-        self.cb_model_version.addItems(sorted(ULTRALYTICS_MODELS.keys()))
+        self.cb_model_version.addItems(_SORTED_MODEL_VERSIONS)
         self.cb_model_version.currentTextChanged.connect(self.on_model_version_changed)
         version_layout.addRow("模型版本:", self.cb_model_version)
         version_size_task_layout.addLayout(version_layout)
@@ -419,14 +525,26 @@ class AutoLabelDialog(QDialog):
         enable_mapping_layout.addStretch()
         layout.addLayout(enable_mapping_layout)
         
+        self.model_classes_path = ""
+        self.model_classes = []
+        
+        # 映射控件占位容器：首次勾选“启用类别映射”时才创建列表和按钮
+        self._mapping_built = False
+        self.mapping_container = QWidget()
+        self._mapping_container_layout = QVBoxLayout(self.mapping_container)
+        self._mapping_container_layout.setContentsMargins(0, 0, 0, 0)
+        layout.addWidget(self.mapping_container)
+        
+        return group
+    
+    def _build_mapping_widgets(self, layout: QVBoxLayout):
+        """创建类别映射的列表和按钮（延迟到首次启用映射时）"""
         # 模型类别文件加载
         model_class_file_layout = QHBoxLayout()
         self.btn_load_classes = QPushButton("加载模型classes.txt")
         self.btn_load_classes.clicked.connect(self.load_model_classes)
         self.btn_load_classes.setEnabled(False)
         model_class_file_layout.addWidget(self.btn_load_classes)
-        self.model_classes_path = ""
-        self.model_classes = []
         layout.addLayout(model_class_file_layout)
         
         # 分割器
@@ -436,7 +554,8 @@ class AutoLabelDialog(QDialog):
         model_class_widget = QWidget()
         model_class_layout = QVBoxLayout(model_class_widget)
         model_class_layout.addWidget(QLabel("模型类别"))
-        self.model_class_list = QListWidget()
+        self.model_class_model = ClassListModel(self)
+        self.model_class_list = self._create_class_list_view(self.model_class_model)
         model_class_layout.addWidget(self.model_class_list)
         splitter.addWidget(model_class_widget)
         
@@ -444,7 +563,8 @@ class AutoLabelDialog(QDialog):
         project_class_widget = QWidget()
         project_class_layout = QVBoxLayout(project_class_widget)
         project_class_layout.addWidget(QLabel("项目类别"))
-        self.project_class_list = QListWidget()
+        self.project_class_model = ClassListModel(self)
+        self.project_class_list = self._create_class_list_view(self.project_class_model)
         project_class_layout.addWidget(self.project_class_list)
         splitter.addWidget(project_class_widget)
         
@@ -465,66 +585,58 @@ class AutoLabelDialog(QDialog):
         
         layout.addLayout(mapping_buttons_layout)
         
+        self._mapping_built = True
+        
         # 初始化类别列表
         self.update_class_lists()
-        
-        return group
+    
+    def _create_class_list_view(self, model: ClassListModel) -> QListView:
+        """创建类别列表视图：统一行高、分批布局，类别很多时首次显示也不卡顿"""
+        view = QListView()
+        view.setModel(model)
+        view.setUniformItemSizes(True)
+        view.setLayoutMode(QListView.LayoutMode.Batched)
+        view.setBatchSize(100)
+        view.setSelectionMode(QAbstractItemView.SelectionMode.SingleSelection)
+        return view
     
     def get_group_style(self) -> str:
         """获取分组框样式"""
-        return f"""
-            QGroupBox {{
-                font-weight: bold;
-                border: 1px solid {COLORS['border']};
-                border-radius: 6px;
-                margin-top: 12px;
-                padding-top: 10px;
-            }}
-            QGroupBox::title {{
-                subcontrol-origin: margin;
-                left: 10px;
-                padding: 0 5px;
-            }}
-        """
+        return _GROUP_BOX_QSS
     
     def get_inner_group_style(self) -> str:
         """获取内部分组框样式"""
-        return f"""
-            QGroupBox {{
-                font-weight: normal;
-                border: 1px solid {COLORS['border']};
-                border-radius: 4px;
-                margin-top: 8px;
-                padding-top: 8px;
-            }}
-            QGroupBox::title {{
-                subcontrol-origin: margin;
-                left: 8px;
-                padding: 0 4px;
-                font-size: 12px;
-            }}
-        """
+        return _INNER_GROUP_BOX_QSS
     
     def on_model_version_changed(self, version: str):
         """模型版本改变时更新型号和任务类型列表"""
-        self.cb_model_size.clear()
-        self.cb_model_task.clear()
-        
-        if version in ULTRALYTICS_MODELS:
-            # 更新型号列表
-            sizes = ULTRALYTICS_MODELS[version]['sizes']
-            for size in sizes:
-                display_name = SIZE_NAMES.get(size, size)
-                self.cb_model_size.addItem(display_name, size)
-            
-            # 更新任务类型列表
-            tasks = ULTRALYTICS_MODELS[version]['tasks']
-            for task in tasks:
-                self.cb_model_task.addItem(task)
+        # 批量填充期间暂停信号和重绘，每个下拉框只做一次布局
+        combos = (self.cb_model_size, self.cb_model_task)
+        for combo in combos:
+            combo.blockSignals(True)
+            combo.setUpdatesEnabled(False)
+        try:
+            self.cb_model_size.clear()
+            self.cb_model_task.clear()
             
-            # 默认选择第一个任务类型
-            if tasks:
-                self.cb_model_task.setCurrentIndex(0)
+            if version in ULTRALYTICS_MODELS:
+                # 更新型号列表：一次加入全部显示名称，再逐项设置型号数据
+                size_items = _SIZE_ITEMS[version]
+                self.cb_model_size.addItems([display_name for display_name, _ in size_items])
+                for index, (_, size) in enumerate(size_items):
+                    self.cb_model_size.setItemData(index, size)
+                
+                # 更新任务类型列表
+                tasks = ULTRALYTICS_MODELS[version]['tasks']
+                self.cb_model_task.addItems(tasks)
+                
+                # 默认选择第一个任务类型
+                if tasks:
+                    self.cb_model_task.setCurrentIndex(0)
+        finally:
+            for combo in combos:
+                combo.setUpdatesEnabled(True)
+                combo.blockSignals(False)
     
     def on_model_source_changed(self):
         """模型来源改变时更新界面"""
@@ -544,30 +656,6 @@ class AutoLabelDialog(QDialog):
         if file_path:
             self.custom_model_path = file_path
     
-    def update_class_lists(self):
-        """更新类别列表"""
-        # 清空列表
-        self.model_class_list.clear()
-        self.project_class_list.clear()
-        
-        # 添加模型类别（示例）
-        model_classes = ["person", "car", "dog", "cat", "bird"]
-        for i, cls in enumerate(model_classes):
-            item = QListWidgetItem(f"{i}: {cls}")
-            self.model_class_list.addItem(item)
-        
-        # 添加项目类别
-        for cls in self.project_classes:
-            item = QListWidgetItem(f"{cls['id']}: {cls['name']}")
-            color = QColor(cls.get('color', '#808080'))
-            item.setForeground(color)
-            self.project_class_list.addItem(item)
-    
-    def edit_mapping(self):
-        """编辑类别映射"""
-        # 这里可以实现一个更复杂的映射编辑界面
-        QMessageBox.information(self, "编辑映射", "类别映射编辑功能开发中...")
-    
     def add_class(self):
         """添加新类别"""
         # 这里可以实现添加新类别的功能
@@ -635,17 +723,19 @@ class AutoLabelDialog(QDialog):
         if self.model_source == "custom":
             return self.custom_model_path
         else:
-            # 构建官方模型名称
+            # 官方模型名称已在导入时预先生成
             version = self.cb_model_version.currentText()
             size = self.cb_model_size.currentData() or self.cb_model_size.currentText()
-            if version in ULTRALYTICS_MODELS:
-                prefix = ULTRALYTICS_MODELS[version]['prefix']
-                return f"{prefix}{size}"
-        return ""
+            return _MODEL_NAMES.get((version, size), "")
     
     def on_enable_mapping_changed(self, state):
         """启用映射选项改变时的处理"""
         enabled = state == Qt.CheckState.Checked.value
+        if not self._mapping_built:
+            if not enabled:
+                return
+            self._build_mapping_widgets(self._mapping_container_layout)
+        self.mapping_container.setVisible(enabled)
         self.btn_load_classes.setEnabled(enabled)
         self.btn_edit_mapping.setEnabled(enabled and len(self.model_classes) > 0)
         self.btn_apply_all.setEnabled(enabled and len(self.model_classes) > 0)
@@ -658,33 +748,56 @@ class AutoLabelDialog(QDialog):
         )
         if file_path:
             try:
-                with open(file_path, 'r', encoding='utf-8') as f:
-                    classes = [line.strip() for line in f if line.strip()]
+                classes, truncated = self._load_classes_cached(file_path)
                 if classes:
                     self.model_classes_path = file_path
                     self.model_classes = classes
                     self.update_model_class_list()
                     self.btn_edit_mapping.setEnabled(True)
                     self.btn_apply_all.setEnabled(True)
-                    QMessageBox.information(self, "成功", f"成功加载 {len(classes)} 个模型类别")
+                    message = f"成功加载 {len(classes)} 个模型类别"
+                    if truncated:
+                        message += f"\n（文件类别数超过上限，只加载了前 {MAX_MODEL_CLASSES} 个）"
+                    QMessageBox.information(self, "成功", message)
                 else:
                     QMessageBox.warning(self, "警告", "classes.txt文件为空")
             except Exception as e:
                 QMessageBox.critical(self, "错误", f"加载classes.txt文件失败: {str(e)}")
     
+    @staticmethod
+    def _load_classes_cached(file_path: str):
+        """读取classes.txt，返回 (类别列表, 是否截断)
+
+        解析结果缓存在进程内，源文件修改时间和大小不变时再次选择直接复用。
+        """
+        stat = os.stat(file_path)
+        cache_key = (file_path, stat.st_mtime_ns, stat.st_size, MAX_MODEL_CLASSES)
+        cached = _model_classes_cache.get(cache_key)
+        if cached is not None:
+            classes, truncated = cached
+            return list(classes), truncated
+
+        # 逐行读取，每行只strip一次；达到上限即停止，避免误选大文件时占满内存
+        classes = []
+        truncated = False
+        with open(file_path, 'r', encoding='utf-8') as f:
+            for line in f:
+                name = line.strip()
+                if not name:
+                    continue
+                if len(classes) >= MAX_MODEL_CLASSES:
+                    truncated = True
+                    break
+                classes.append(name)
+
+        _model_classes_cache[cache_key] = (tuple(classes), truncated)
+        return classes, truncated
+    
     def update_model_class_list(self):
-        """更新模型类别列表"""
-        self.model_class_list.clear()
-        if self.model_classes:
-            for i, cls in enumerate(self.model_classes):
-                item = QListWidgetItem(f"{i}: {cls}")
-                self.model_class_list.addItem(item)
-        else:
-            # 添加默认模型类别（示例）
-            model_classes = ["person", "car", "dog", "cat", "bird"]
-            for i, cls in enumerate(model_classes):
-                item = QListWidgetItem(f"{i}: {cls}")
-                self.model_class_list.addItem(item)
+        """更新模型类别列表（未加载classes.txt时显示示例类别）"""
+        if not self._mapping_built:
+            return
+        self.model_class_model.set_classes(self.model_classes or EXAMPLE_MODEL_CLASSES)
     
     def apply_all_model_classes(self):
         """一键应用模型类别到项目"""
@@ -692,17 +805,20 @@ class AutoLabelDialog(QDialog):
             QMessageBox.warning(self, "警告", "请先加载模型classes.txt文件")
             return
         
+        import numpy as np
+        
+        # 一次生成全部随机颜色
+        colors = np.random.default_rng().integers(0, 0x1000000, size=len(self.model_classes))
+        
         # 创建新的项目类别列表
-        new_classes = []
-        for i, cls_name in enumerate(self.model_classes):
-            # 生成随机颜色
-            import random
-            color = f"#{random.randint(0, 0xFFFFFF):06x}"
-            new_classes.append({
+        new_classes = [
+            {
                 'id': i,
                 'name': cls_name,
-                'color': color
-            })
+                'color': f"#{color:06x}"
+            }
+            for i, (cls_name, color) in enumerate(zip(self.model_classes, colors.tolist()))
+        ]
         
         # 更新项目类别
         self.project_classes = new_classes
@@ -714,12 +830,9 @@ class AutoLabelDialog(QDialog):
     
     def update_project_class_list(self):
         """更新项目类别列表"""
-        self.project_class_list.clear()
-        for cls in self.project_classes:
-            item = QListWidgetItem(f"{cls['id']}: {cls['name']}")
-            color = QColor(cls.get('color', '#808080'))
-            item.setForeground(color)
-            self.project_class_list.addItem(item)
+        if not self._mapping_built:
+            return
+        self.project_class_model.set_classes(self.project_classes)
     
     def edit_mapping(self):
         """编辑类别映射"""
@@ -875,28 +988,8 @@ class AutoLabelDialog(QDialog):
     
     def update_class_lists(self):
         """更新类别列表"""
-        # 清空列表
-        self.model_class_list.clear()
-        self.project_class_list.clear()
-        
-        # 添加模型类别
-        if self.model_classes:
-            for i, cls in enumerate(self.model_classes):
-                item = QListWidgetItem(f"{i}: {cls}")
-                self.model_class_list.addItem(item)
-        else:
-            # 添加默认模型类别（示例）
-            model_classes = ["person", "car", "dog", "cat", "bird"]
-            for i, cls in enumerate(model_classes):
-                item = QListWidgetItem(f"{i}: {cls}")
-                self.model_class_list.addItem(item)
-        
-        # 添加项目类别
-        for cls in self.project_classes:
-            item = QListWidgetItem(f"{cls['id']}: {cls['name']}")
-            color = QColor(cls.get('color', '#808080'))
-            item.setForeground(color)
-            self.project_class_list.addItem(item)
+        self.update_model_class_list()
+        self.update_project_class_list()
     
     def set_classes(self, classes: list):
         """设置项目类别"""
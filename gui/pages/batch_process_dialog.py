@@ -6,17 +6,133 @@
 
 from PyQt6.QtWidgets import (
     QDialog, QVBoxLayout, QHBoxLayout, QLabel, QPushButton,
-    QGroupBox, QFormLayout, QSpinBox, QComboBox, QListWidget,
-    QListWidgetItem, QRadioButton, QButtonGroup, QMessageBox,
-    QSplitter, QWidget, QScrollArea, QFrame
+    QGroupBox, QFormLayout, QSpinBox, QComboBox, QListView,
+    QAbstractItemView, QRadioButton, QButtonGroup, QMessageBox,
+    QSplitter, QWidget, QScrollArea, QFrame, QStackedWidget
 )
-from PyQt6.QtCore import Qt, pyqtSignal
+from PyQt6.QtCore import Qt, pyqtSignal, QAbstractListModel, QModelIndex, QTimer
 from PyQt6.QtGui import QColor
 import os
 from typing import List, Dict, Tuple, Optional
 
 from gui.styles import COLORS
 
+POINT_REFRESH_DELAY_MS = 16  # 连续添加像素点时，状态标签和按钮合并到一次刷新
+
+
+# 样式表在导入时格式化一次（COLORS 为静态配置）
+_GROUP_BOX_QSS = f"""
+    QGroupBox#batchGroup {{
+        font-weight: bold;
+        border: 1px solid {COLORS['border']};
+        border-radius: 6px;
+        margin-top: 12px;
+        padding-top: 10px;
+    }}
+    QGroupBox#batchGroup::title {{
+        subcontrol-origin: margin;
+        left: 10px;
+        padding: 0 5px;
+    }}
+"""
+_RADIO_QSS = """
+    QRadioButton {
+        color: white;
+        font-size: 14px;
+    }
+    QRadioButton::indicator {
+        width: 16px;
+        height: 16px;
+        border-radius: 8px;
+        border: 2px solid white;
+        background-color: transparent;
+    }
+    QRadioButton::indicator:checked {
+        background-color: white;
+        border: 2px solid white;
+    }
+    QRadioButton::indicator:unchecked {
+        background-color: transparent;
+        border: 2px solid white;
+    }
+"""
+_EXECUTE_BUTTON_QSS = f"""
+    QPushButton#btnExecute {{
+        background-color: {COLORS['primary']};
+        color: white;
+        font-weight: bold;
+        padding: 10px 20px;
+    }}
+    QPushButton#btnExecute:hover {{
+        background-color: {COLORS['primary']};
+    }}
+    QPushButton#btnExecute:disabled {{
+        background-color: gray;
+    }}
+"""
+_DIALOG_QSS = _GROUP_BOX_QSS + _RADIO_QSS + _EXECUTE_BUTTON_QSS
+
+
+class BatchClassListModel(QAbstractListModel):
+    """类别列表模型：包装预先计算好的 (显示文本, 类别ID, 颜色) 列表，可被多个视图共用"""
+    
+    def __init__(self, entries: list, parent=None):
+        super().__init__(parent)
+        self._entries = entries
+    
+    def rowCount(self, parent=QModelIndex()) -> int:
+        return 0 if parent.isValid() else len(self._entries)
+    
+    def data(self, index: QModelIndex, role=Qt.ItemDataRole.DisplayRole):
+        if not index.isValid():
+            return None
+        
+        text, class_id, color = self._entries[index.row()]
+        if role == Qt.ItemDataRole.DisplayRole:
+            return text
+        if role == Qt.ItemDataRole.ForegroundRole:
+            return color
+        if role == Qt.ItemDataRole.UserRole:
+            return class_id
+        return None
+
+
+class PointListModel(QAbstractListModel):
+    """像素点列表模型：直接显示对话框的 selected_points，不为每个点创建列表项"""
+    
+    def __init__(self, points: list, parent=None):
+        super().__init__(parent)
+        self._points = points
+    
+    def append_point(self, point: Tuple[int, int]):
+        """追加一个像素点，只通知新增的一行"""
+        row = len(self._points)
+        self.beginInsertRows(QModelIndex(), row, row)
+        self._points.append(point)
+        self.endInsertRows()
+    
+    def clear(self):
+        """清空像素点列表"""
+        self.beginResetModel()
+        self._points.clear()
+        self.endResetModel()
+    
+    def reset(self):
+        """像素点列表整体变化后刷新视图"""
+        self.beginResetModel()
+        self.endResetModel()
+    
+    def rowCount(self, parent=QModelIndex()) -> int:
+        return 0 if parent.isValid() else len(self._points)
+    
+    def data(self, index: QModelIndex, role=Qt.ItemDataRole.DisplayRole):
+        if not index.isValid() or role != Qt.ItemDataRole.DisplayRole:
+            return None
+        
+        row = index.row()
+        x, y = self._points[row]
+        return f"点 {row+1}: ({x}, {y})"
+
 
 class BatchProcessDialog(QDialog):
     """批量处理标注对话框"""
@@ -43,15 +159,35 @@ class BatchProcessDialog(QDialog):
         # 项目类别
         self.project_classes = project_classes or []
         self.total_images = total_images
+        # 类别列表项内容 (显示文本, 类别ID, 颜色) 只计算一次，三个类别列表共用；
+        # 相同颜色字符串只解析一次 QColor
+        qcolors = {}
+        self._class_cache = []
+        for cls in self.project_classes:
+            color_name = cls.get('color', '#808080')
+            color = qcolors.get(color_name)
+            if color is None:
+                color = qcolors[color_name] = QColor(color_name)
+            self._class_cache.append((f"{cls['id']}: {cls['name']}", cls['id'], color))
         
         # 选择的像素点
         self.selected_points = []
+        self.points_model = PointListModel(self.selected_points, self)
+        
+        # 连续点击添加像素点时合并状态刷新
+        self._refresh_timer = QTimer(self)
+        self._refresh_timer.setSingleShot(True)
+        self._refresh_timer.setInterval(POINT_REFRESH_DELAY_MS)
+        self._refresh_timer.timeout.connect(self._do_refresh)
         
         # 初始化UI
         self.init_ui()
     
     def init_ui(self):
         """初始化界面"""
+        # 分组框、单选按钮和执行按钮的样式统一设置在对话框上，只解析一次
+        self.setStyleSheet(_DIALOG_QSS)
+        
         main_layout = QVBoxLayout(self)
         main_layout.setContentsMargins(20, 20, 20, 20)
         main_layout.setSpacing(16)
@@ -68,14 +204,16 @@ class BatchProcessDialog(QDialog):
         
         # 步骤1：像素点选择状态
         self.point_group = QGroupBox("步骤1：像素点选择")
-        self.point_group.setStyleSheet(self.get_group_style())
+        self.point_group.setObjectName("batchGroup")
         point_layout = QVBoxLayout(self.point_group)
         
         self.point_status = QLabel("未选择像素点")
         self.point_status.setStyleSheet("color: orange;")
         point_layout.addWidget(self.point_status)
         
-        self.selected_points_list = QListWidget()
+        self.selected_points_list = QListView()
+        self.selected_points_list.setModel(self.points_model)
+        self.selected_points_list.setUniformItemSizes(True)
         self.selected_points_list.setMaximumHeight(100)
         point_layout.addWidget(self.selected_points_list)
         
@@ -91,7 +229,7 @@ class BatchProcessDialog(QDialog):
         
         # 步骤2：处理范围
         range_group = QGroupBox("步骤2：处理范围")
-        range_group.setStyleSheet(self.get_group_style())
+        range_group.setObjectName("batchGroup")
         range_layout = QFormLayout(range_group)
         
         self.start_image = QSpinBox()
@@ -112,7 +250,7 @@ class BatchProcessDialog(QDialog):
         
         # 步骤3：操作类型
         op_group = QGroupBox("步骤3：操作类型")
-        op_group.setStyleSheet(self.get_group_style())
+        op_group.setObjectName("batchGroup")
         op_layout = QVBoxLayout(op_group)
         
         self.op_group = QButtonGroup(self)
@@ -120,53 +258,11 @@ class BatchProcessDialog(QDialog):
         self.rbtn_delete = QRadioButton("批量删除")
         self.rbtn_delete.setChecked(True)
         self.rbtn_delete.toggled.connect(self.on_operation_changed)
-        self.rbtn_delete.setStyleSheet("""
-            QRadioButton {
-                color: white;
-                font-size: 14px;
-            }
-            QRadioButton::indicator {
-                width: 16px;
-                height: 16px;
-                border-radius: 8px;
-                border: 2px solid white;
-                background-color: transparent;
-            }
-            QRadioButton::indicator:checked {
-                background-color: white;
-                border: 2px solid white;
-            }
-            QRadioButton::indicator:unchecked {
-                background-color: transparent;
-                border: 2px solid white;
-            }
-        """)
         self.op_group.addButton(self.rbtn_delete)
         op_layout.addWidget(self.rbtn_delete)
         
         self.rbtn_modify = QRadioButton("批量修改类别")
         self.rbtn_modify.toggled.connect(self.on_operation_changed)
-        self.rbtn_modify.setStyleSheet("""
-            QRadioButton {
-                color: white;
-                font-size: 14px;
-            }
-            QRadioButton::indicator {
-                width: 16px;
-                height: 16px;
-                border-radius: 8px;
-                border: 2px solid white;
-                background-color: transparent;
-            }
-            QRadioButton::indicator:checked {
-                background-color: white;
-                border: 2px solid white;
-            }
-            QRadioButton::indicator:unchecked {
-                background-color: transparent;
-                border: 2px solid white;
-            }
-        """)
         self.op_group.addButton(self.rbtn_modify)
         op_layout.addWidget(self.rbtn_modify)
         
@@ -174,13 +270,11 @@ class BatchProcessDialog(QDialog):
         
         # 步骤4：类别选择
         self.class_group = QGroupBox("步骤4：类别选择")
-        self.class_group.setStyleSheet(self.get_group_style())
+        self.class_group.setObjectName("batchGroup")
         self.class_layout = QVBoxLayout(self.class_group)
         
-        # 根据操作类型动态显示不同的类别选择界面
-        self.class_stack = QWidget()
-        self.class_stack_layout = QVBoxLayout(self.class_stack)
-        self.class_stack_layout.setContentsMargins(0, 0, 0, 0)
+        # 根据操作类型切换不同的类别选择界面
+        self.class_stack = QStackedWidget()
         
         # 删除模式：多选要删除的类别
         self.delete_class_widget = QWidget()
@@ -190,14 +284,55 @@ class BatchProcessDialog(QDialog):
         delete_label = QLabel("选择要删除的类别（可多选）:")
         delete_class_layout.addWidget(delete_label)
         
-        self.delete_class_list = QListWidget()
-        self.delete_class_list.setSelectionMode(QListWidget.SelectionMode.MultiSelection)
-        self.populate_class_list(self.delete_class_list)
+        # 三个类别列表共用同一个模型，各自维护选中状态
+        self.class_model = BatchClassListModel(self._class_cache, self)
+        
+        self.delete_class_list = self.create_class_list_view(
+            QAbstractItemView.SelectionMode.MultiSelection)
         delete_class_layout.addWidget(self.delete_class_list)
         
-        self.class_stack_layout.addWidget(self.delete_class_widget)
+        self.class_stack.addWidget(self.delete_class_widget)
+        
+        # 修改模式：多选初始类别，单选目标类别（首次切换到该模式时才创建）
+        self.modify_class_widget = None
         
-        # 修改模式：多选初始类别，单选目标类别
+        self.class_layout.addWidget(self.class_stack)
+        main_layout.addWidget(self.class_group)
+        
+        # 底部按钮
+        button_layout = QHBoxLayout()
+        
+        self.btn_execute = QPushButton("执行批量处理")
+        self.btn_execute.setObjectName("btnExecute")
+        self.btn_execute.clicked.connect(self.execute_process)
+        button_layout.addWidget(self.btn_execute)
+        
+        self.btn_cancel = QPushButton("取消")
+        self.btn_cancel.clicked.connect(self.reject)
+        button_layout.addWidget(self.btn_cancel)
+        
+        main_layout.addLayout(button_layout)
+        
+        # 初始状态更新
+        self.update_execute_button()
+    
+    def create_class_list_view(self, selection_mode) -> QListView:
+        """创建共用类别模型的列表视图：统一行高、分批布局"""
+        view = QListView()
+        view.setModel(self.class_model)
+        view.setUniformItemSizes(True)
+        view.setLayoutMode(QListView.LayoutMode.Batched)
+        view.setBatchSize(100)
+        view.setSelectionMode(selection_mode)
+        return view
+    
+    def get_selected_class_ids(self, view: QListView) -> List[int]:
+        """获取列表视图中选中的类别ID（按列表顺序）"""
+        rows = sorted(index.row() for index in view.selectionModel().selectedRows())
+        return [self._class_cache[row][1] for row in rows]
+    
+    def _build_modify_widget(self):
+        """创建修改模式的类别选择界面"""
         self.modify_class_widget = QWidget()
         modify_class_layout = QVBoxLayout(self.modify_class_widget)
         modify_class_layout.setContentsMargins(0, 0, 0, 0)
@@ -207,9 +342,8 @@ class BatchProcessDialog(QDialog):
         source_label = QLabel("选择初始类别（可多选）:")
         source_layout.addWidget(source_label)
         
-        self.source_class_list = QListWidget()
-        self.source_class_list.setSelectionMode(QListWidget.SelectionMode.MultiSelection)
-        self.populate_class_list(self.source_class_list)
+        self.source_class_list = self.create_class_list_view(
+            QAbstractItemView.SelectionMode.MultiSelection)
         source_layout.addWidget(self.source_class_list)
         
         modify_class_layout.addLayout(source_layout)
@@ -219,106 +353,48 @@ class BatchProcessDialog(QDialog):
         target_label = QLabel("选择目标类别（单选）:")
         target_layout.addWidget(target_label)
         
-        self.target_class_list = QListWidget()
-        self.target_class_list.setSelectionMode(QListWidget.SelectionMode.SingleSelection)
-        self.populate_class_list(self.target_class_list)
+        self.target_class_list = self.create_class_list_view(
+            QAbstractItemView.SelectionMode.SingleSelection)
         target_layout.addWidget(self.target_class_list)
         
         modify_class_layout.addLayout(target_layout)
         
-        self.class_stack_layout.addWidget(self.modify_class_widget)
-        self.modify_class_widget.hide()
-        
-        self.class_layout.addWidget(self.class_stack)
-        main_layout.addWidget(self.class_group)
-        
-        # 底部按钮
-        button_layout = QHBoxLayout()
-        
-        self.btn_execute = QPushButton("执行批量处理")
-        self.btn_execute.setStyleSheet(f"""
-            QPushButton {{
-                background-color: {COLORS['primary']};
-                color: white;
-                font-weight: bold;
-                padding: 10px 20px;
-            }}
-            QPushButton:hover {{
-                background-color: {COLORS['primary']};
-            }}
-            QPushButton:disabled {{
-                background-color: gray;
-            }}
-        """)
-        self.btn_execute.clicked.connect(self.execute_process)
-        button_layout.addWidget(self.btn_execute)
-        
-        self.btn_cancel = QPushButton("取消")
-        self.btn_cancel.clicked.connect(self.reject)
-        button_layout.addWidget(self.btn_cancel)
-        
-        main_layout.addLayout(button_layout)
-        
-        # 初始状态更新
-        self.update_execute_button()
-    
-    def get_group_style(self) -> str:
-        """获取分组框样式"""
-        return f"""
-            QGroupBox {{
-                font-weight: bold;
-                border: 1px solid {COLORS['border']};
-                border-radius: 6px;
-                margin-top: 12px;
-                padding-top: 10px;
-            }}
-            QGroupBox::title {{
-                subcontrol-origin: margin;
-                left: 10px;
-                padding: 0 5px;
-            }}
-        """
-    
-    def populate_class_list(self, list_widget: QListWidget):
-        """填充类别列表"""
-        list_widget.clear()
-        for cls in self.project_classes:
-            item = QListWidgetItem(f"{cls['id']}: {cls['name']}")
-            item.setData(Qt.ItemDataRole.UserRole, cls['id'])
-            # 设置颜色
-            color = QColor(cls.get('color', '#808080'))
-            item.setForeground(color)
-            list_widget.addItem(item)
+        self.class_stack.addWidget(self.modify_class_widget)
     
     def on_operation_changed(self):
         """操作类型改变时"""
         if self.rbtn_delete.isChecked():
-            self.delete_class_widget.show()
-            self.modify_class_widget.hide()
+            self.class_stack.setCurrentWidget(self.delete_class_widget)
         else:
-            self.delete_class_widget.hide()
-            self.modify_class_widget.show()
+            if self.modify_class_widget is None:
+                self._build_modify_widget()
+            self.class_stack.setCurrentWidget(self.modify_class_widget)
     
     def add_point(self, x: int, y: int):
         """添加像素点"""
-        self.selected_points.append((x, y))
-        self.update_points_display()
-        self.update_execute_button()
+        # 只追加新的一行，不重建整个列表；状态刷新推迟到本轮点击结束后合并执行
+        self.points_model.append_point((x, y))
+        self._refresh_timer.start()
     
     def clear_points(self):
         """清除所有像素点"""
-        self.selected_points.clear()
-        self.update_points_display()
+        self._refresh_timer.stop()
+        self.points_model.clear()
+        self._refresh_status()
         self.update_execute_button()
     
     def update_points_display(self):
-        """更新像素点显示"""
-        self.selected_points_list.clear()
-        for i, (x, y) in enumerate(self.selected_points):
-            item = QListWidgetItem(f"点 {i+1}: ({x}, {y})")
-            self.selected_points_list.addItem(item)
-        
-        # 更新状态
+        """更新像素点显示（像素点整体变化后重建列表）"""
+        self.points_model.reset()
+        self._refresh_status()
+    
+    def _do_refresh(self):
+        """合并后的刷新：更新状态标签和按钮状态"""
+        self._refresh_status()
+        self.update_execute_button()
+    
+    def _refresh_status(self):
+        """更新像素点选择状态和清除按钮"""
         if self.selected_points:
             self.point_status.setText(f"已选择 {len(self.selected_points)} 个像素点")
             self.point_status.setStyleSheet("color: green;")
@@ -349,7 +425,7 @@ class BatchProcessDialog(QDialog):
         
         # 构建处理配置
         config = {
-            'points': self.selected_points.copy(),
+            'points': tuple(self.selected_points),
             'start_idx': start_idx,
             'end_idx': end_idx,
             'operation': 'delete' if self.rbtn_delete.isChecked() else 'modify'
@@ -357,30 +433,30 @@ class BatchProcessDialog(QDialog):
         
         if self.rbtn_delete.isChecked():
             # 获取要删除的类别
-            selected_items = self.delete_class_list.selectedItems()
-            if not selected_items:
+            target_classes = self.get_selected_class_ids(self.delete_class_list)
+            if not target_classes:
                 QMessageBox.warning(self, "提示", "请选择要删除的类别")
                 return
-            config['target_classes'] = [item.data(Qt.ItemDataRole.UserRole) for item in selected_items]
+            config['target_classes'] = target_classes
         else:
             # 获取初始类别和目标类别
-            source_items = self.source_class_list.selectedItems()
-            if not source_items:
+            source_classes = self.get_selected_class_ids(self.source_class_list)
+            if not source_classes:
                 QMessageBox.warning(self, "提示", "请选择初始类别")
                 return
             
-            target_items = self.target_class_list.selectedItems()
-            if not target_items:
+            target_classes = self.get_selected_class_ids(self.target_class_list)
+            if not target_classes:
                 QMessageBox.warning(self, "提示", "请选择目标类别")
                 return
             
-            config['source_classes'] = [item.data(Qt.ItemDataRole.UserRole) for item in source_items]
-            config['target_class'] = target_items[0].data(Qt.ItemDataRole.UserRole)
+            config['source_classes'] = source_classes
+            config['target_class'] = target_classes[0]
         
         # 发送处理请求
         self.process_requested.emit(config)
         self.accept()
     
-    def get_selected_points(self) -> List[Tuple[int, int]]:
-        """获取选择的像素点"""
-        return self.selected_points.copy()
+    def get_selected_points(self) -> Tuple[Tuple[int, int], ...]:
+        """获取选择的像素点（只读快照）"""
+        return tuple(self.selected_points)
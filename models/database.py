@@ -9,8 +9,12 @@ import json
 from datetime import datetime
 from pathlib import Path
 from typing import List, Dict, Optional, Any
+from collections import defaultdict
 from contextlib import contextmanager
 
+# 单条 SQL 中 IN (...) 占位符的分块大小（低于 SQLite 默认的 999 个变量上限）
+SQL_IN_CHUNK_SIZE = 900
+
 
 class Database:
     """数据库管理类"""
@@ -626,6 +630,47 @@ class Database:
             
             return cursor.lastrowid
     
+    def add_annotations(self, image_id: int, project_id: int, annotations: List[Dict],
+                        replace: bool = False) -> int:
+        """
+        批量添加同一图像的标注（单个事务）
+        
+        Args:
+            image_id: 图像ID
+            project_id: 项目ID
+            annotations: 标注列表，每项包含 class_id、class_name、type、data，可选 attributes
+            replace: 是否先删除该图像的原有标注（与写入在同一事务中完成）
+        """
+        if not annotations and not replace:
+            return 0
+        
+        rows = [
+            (image_id, project_id, ann['class_id'], ann['class_name'], ann['type'],
+             json.dumps(ann['data']), json.dumps(ann.get('attributes') or {}))
+            for ann in annotations
+        ]
+        
+        with self.get_connection() as conn:
+            cursor = conn.cursor()
+            if replace:
+                cursor.execute("DELETE FROM annotations WHERE image_id = ?", (image_id,))
+                if not rows:
+                    return 0
+            
+            cursor.executemany("""
+                INSERT INTO annotations 
+                (image_id, project_id, class_id, class_name, type, data, attributes)
+                VALUES (?, ?, ?, ?, ?, ?, ?)
+            """, rows)
+            
+            # 更新图像状态
+            cursor.execute(
+                "UPDATE images SET status = 'annotated', annotated_at = ? WHERE id = ?",
+                (datetime.now().isoformat(), image_id)
+            )
+            
+            return len(rows)
+    
     def update_annotation(
         self,
         annotation_id: int,
@@ -689,6 +734,44 @@ class Database:
                 annotations.append(ann)
             return annotations
     
+    def get_project_annotations(self, project_id: int) -> Dict[int, List[Dict]]:
+        """一次查询获取项目的所有标注，按图像分组返回 {图像ID: 标注列表}（没有标注的图像不在结果中）"""
+        result = defaultdict(list)
+        with self.get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute(
+                "SELECT * FROM annotations WHERE project_id = ? ORDER BY image_id, id",
+                (project_id,)
+            )
+            for row in cursor.fetchall():
+                ann = dict(row)
+                ann['data'] = json.loads(ann['data'])
+                ann['attributes'] = json.loads(ann['attributes'])
+                result[ann['image_id']].append(ann)
+        return dict(result)
+    
+    def get_annotations_for_images(self, image_ids: List[int]) -> Dict[int, List[Dict]]:
+        """批量获取多张图像的标注，返回 {图像ID: 标注列表}（没有标注的图像对应空列表）"""
+        result = {image_id: [] for image_id in image_ids}
+        if not image_ids:
+            return result
+        
+        with self.get_connection() as conn:
+            cursor = conn.cursor()
+            for start in range(0, len(image_ids), SQL_IN_CHUNK_SIZE):
+                chunk = image_ids[start:start + SQL_IN_CHUNK_SIZE]
+                placeholders = ", ".join("?" * len(chunk))
+                cursor.execute(
+                    f"SELECT * FROM annotations WHERE image_id IN ({placeholders})",
+                    chunk
+                )
+                for row in cursor.fetchall():
+                    ann = dict(row)
+                    ann['data'] = json.loads(ann['data'])
+                    ann['attributes'] = json.loads(ann['attributes'])
+                    result[ann['image_id']].append(ann)
+        return result
+    
     def delete_annotation(self, annotation_id: int) -> bool:
         """删除标注"""
         with self.get_connection() as conn:
@@ -696,6 +779,94 @@ class Database:
             cursor.execute("DELETE FROM annotations WHERE id = ?", (annotation_id,))
             return cursor.rowcount > 0
     
+    def delete_annotations(self, annotation_ids: List[int]) -> int:
+        """批量删除标注（单个事务），返回删除的行数"""
+        if not annotation_ids:
+            return 0
+        
+        deleted = 0
+        with self.get_connection() as conn:
+            cursor = conn.cursor()
+            for start in range(0, len(annotation_ids), SQL_IN_CHUNK_SIZE):
+                chunk = annotation_ids[start:start + SQL_IN_CHUNK_SIZE]
+                placeholders = ", ".join("?" * len(chunk))
+                cursor.execute(
+                    f"DELETE FROM annotations WHERE id IN ({placeholders})",
+                    chunk
+                )
+                deleted += cursor.rowcount
+        return deleted
+    
+    def delete_annotations_by_class(self, project_id: int, class_id: int,
+                                    classes: List[Dict] = None,
+                                    class_remap: Dict[int, int] = None) -> int:
+        """
+        删除项目中某个类别的所有标注（单个事务），返回删除的行数
+        
+        Args:
+            project_id: 项目ID
+            class_id: 类别ID
+            classes: 删除后的项目类别列表，提供时与删除在同一事务中写入项目
+            class_remap: 剩余类别的 旧ID -> 新ID 映射，提供时在同一事务中改写标注的 class_id
+        """
+        with self.get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute(
+                "DELETE FROM annotations WHERE project_id = ? AND class_id = ?",
+                (project_id, class_id)
+            )
+            deleted = cursor.rowcount
+            
+            if class_remap:
+                self._remap_annotation_classes(cursor, project_id, class_remap)
+            
+            if classes is not None:
+                cursor.execute(
+                    "UPDATE projects SET classes = ?, updated_at = ? WHERE id = ?",
+                    (json.dumps(classes, ensure_ascii=False), datetime.now().isoformat(), project_id)
+                )
+            return deleted
+    
+    def _remap_annotation_classes(self, cursor, project_id: int, remap: Dict[int, int]) -> int:
+        """用单条 UPDATE ... CASE 改写 class_id，避免逐条更新时新旧ID互相覆盖"""
+        remap = {int(old): int(new) for old, new in remap.items() if int(old) != int(new)}
+        if not remap:
+            return 0
+        # 类别ID均为整数，直接内联到语句中，不受 SQLite 参数个数限制
+        cases = " ".join(f"WHEN {old} THEN {new}" for old, new in remap.items())
+        old_ids = ",".join(str(old) for old in remap)
+        cursor.execute(
+            f"UPDATE annotations SET class_id = CASE class_id {cases} END, updated_at = ? "
+            f"WHERE project_id = ? AND class_id IN ({old_ids})",
+            (datetime.now().isoformat(), project_id)
+        )
+        return cursor.rowcount
+    
+    def update_annotations_class(self, annotation_ids: List[int], class_id: int,
+                                 class_name: str = None) -> int:
+        """批量修改标注类别（单个事务），返回更新的行数"""
+        if not annotation_ids:
+            return 0
+        
+        updates = ["class_id = ?", "updated_at = ?"]
+        values = [class_id, datetime.now().isoformat()]
+        if class_name is not None:
+            updates.append("class_name = ?")
+            values.append(class_name)
+        
+        updated = 0
+        with self.get_connection() as conn:
+            cursor = conn.cursor()
+            for start in range(0, len(annotation_ids), SQL_IN_CHUNK_SIZE):
+                chunk = annotation_ids[start:start + SQL_IN_CHUNK_SIZE]
+                placeholders = ", ".join("?" * len(chunk))
+                cursor.execute(
+                    f"UPDATE annotations SET {', '.join(updates)} WHERE id IN ({placeholders})",
+                    [*values, *chunk]
+                )
+                updated += cursor.rowcount
+        return updated
+    
     # ==================== 训练任务操作 ====================
     
     def create_training_job(self, project_id: int, name: str,